@@ -1 +1,3 @@
 from .interpreter import Interpreter, InterpreterError
+from .results import CandidatesResult, CommandResult, GuessResult, ShowResult, SuggestResult, WordsResult
+from .pool import InterpreterPool
\ No newline at end of file
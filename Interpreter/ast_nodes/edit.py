@@ -35,8 +35,21 @@ class Delete(Node):
 class DeleteFile(Node):
     filename: str
 
+@dataclass
+class Import(Node):
+    source: str
+
 class Done(Node):
     pass
 
 class Help(Node):
-    pass
\ No newline at end of file
+    pass
+
+class Begin(Node):
+    pass
+
+class Commit(Node):
+    pass
+
+class Rollback(Node):
+    pass
@@ -14,8 +14,19 @@ class Start(Node):
 class Word(Node):
     word: Optional[str] = None
 
+@dataclass
 class Words(Node):
-    pass
+    offset: int = 0
+    limit: Optional[int] = None
+    prefix: Optional[str] = None
+
+@dataclass
+class Suggest(Node):
+    k: int = 5
+
+@dataclass
+class Candidates(Node):
+    limit: int = 10
 
 @dataclass
 class MaxGuesses(Node):
@@ -0,0 +1,136 @@
+"""Candidate sets for the 'candidates' command.
+
+A game's candidates are the bank rows that would have given every
+feedback received so far. They are kept as a packed bitset (np.packbits
+order, one bit per row) and narrowed after each guess by ANDing masks
+that depend only on the bank: rows with a letter at a position or with
+at least k copies of it (letters mode), rows holding a value in a
+category column (categories mode). Masks are built on first use and
+cached on the bank, so every game on it shares them.
+"""
+from collections import Counter
+import numpy as np
+from . import scoring, solver
+from .wordbank import category_codes
+
+# set bits in each byte value, for NumPy releases without bitwise_count
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# bytes scanned at a time when sampling, so a sample stops early
+_SAMPLE_BLOCK = 1 << 15
+
+def bank_masks(bank):
+    return bank.derived("candidate_masks", BankMasks)
+
+def count(bits):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bits).sum(dtype=np.int64))
+    return int(np.take(_POPCOUNT, bits).sum(dtype=np.int64))
+
+def sample(bits, limit):
+    """Row numbers of the first limit set bits, in bank order."""
+    # every nonzero byte holds at least one row, so limit bytes are enough
+    found, total = [np.zeros(0, dtype=np.intp)], 0
+    for start in range(0, len(bits), _SAMPLE_BLOCK):
+        if total >= limit:
+            break
+        nonzero = np.flatnonzero(bits[start:start + _SAMPLE_BLOCK]) + start
+        found.append(nonzero)
+        total += len(nonzero)
+    nonzero = np.concatenate(found)[:limit]
+    rows = (nonzero[:, None] * 8 + np.arange(8)).ravel()
+    return rows[np.unpackbits(bits[nonzero]).astype(bool)][:limit]
+
+def to_mask(bits, n):
+    """Unpack a bitset into a bool array of n rows."""
+    return np.unpackbits(bits, count=n).astype(bool)
+
+class BankMasks:
+    """Bitset masks over one bank's rows, built on first use."""
+
+    def __init__(self, bank):
+        self.bank = bank
+        self.n = len(bank)
+        self.all = np.packbits(np.ones(self.n, dtype=bool))
+        self._masks = {}
+        self._codes = None
+
+    def _mask(self, key, build):
+        bits = self._masks.get(key)
+        if bits is None:
+            bits = self._masks[key] = np.packbits(build())
+        return bits
+
+    def _letters(self):
+        # (codes, width), width None when the words differ in length
+        if self._codes is None:
+            codes = solver.word_codes(self.bank)
+            width = codes.shape[1]
+            uniform = width > 0 and bool(codes[:, -1].all())
+            self._codes = (codes, width if uniform else None)
+        return self._codes
+
+    def narrow(self, bits, mode, guess, feedback):
+        """AND bits in place with the rows consistent with one guess's feedback."""
+        if mode == "letters":
+            self._narrow_letters(bits, guess, feedback)
+        elif mode == "categories":
+            self._narrow_categories(bits, guess, feedback)
+        elif mode == "hints":
+            row = self.bank.lookup(guess)
+            if row is None:
+                return
+            if feedback and feedback[0] == scoring.CORRECT:
+                keep = bits[row // 8] & (0x80 >> row % 8)
+                bits[:] = 0
+                bits[row // 8] = keep
+            else:
+                bits[row // 8] &= ~np.uint8(0x80 >> row % 8)
+
+    def _narrow_letters(self, bits, guess, feedback):
+        codes, width = self._letters()
+        if width is None or len(guess) != width or len(feedback) != width:
+            # ragged bank or guess; score it against every word instead
+            bits &= np.packbits(solver.consistent(codes, [(guess, feedback)]))
+            return
+        letters = scoring.encode([guess], width)[0].tolist()
+        shown, absent = Counter(), set()
+        for i, (c, f) in enumerate(zip(letters, feedback)):
+            at = self._mask(("at", i, c), lambda: codes[:, i] == c)
+            if f == scoring.CORRECT:
+                bits &= at
+            else:
+                bits &= ~at
+            if f == scoring.ABSENT:
+                absent.add(c)
+            else:
+                shown[c] += 1
+        # a grey copy of a letter means the secret has exactly as many as were coloured
+        for c in set(letters):
+            k = shown[c]
+            if k:
+                bits &= self._at_least(c, k)
+            if c in absent:
+                bits &= ~self._at_least(c, k + 1)
+
+    def _at_least(self, c, k):
+        codes, _ = self._letters()
+        counts = self._masks.get(("count", c))
+        if counts is None:
+            counts = self._masks[("count", c)] = (codes == c).sum(axis=1)
+        return self._mask(("min", c, k), lambda: counts >= k)
+
+    def _narrow_categories(self, bits, guess, feedback):
+        row = self.bank.lookup(guess)
+        if row is None:
+            return
+        columns, _ = category_codes(self.bank)
+        for j, f in enumerate(feedback[:columns.shape[1]]):
+            value = int(columns[row, j])
+            if value < 0:
+                continue  # a short guess row is never correct in this column
+            same = self._mask(("col", j, value), lambda: columns[:, j] == value)
+            if f == scoring.CORRECT:
+                bits &= same
+            else:
+                bits &= ~same
@@ -0,0 +1,21 @@
+"""Compile word banks into .lxb artifacts that load without parsing.
+
+    python -m Interpreter.compiled [bank.txt ...]
+
+With no arguments every WordBanks/*.txt is compiled. load_bank() uses an
+artifact only while its text file is unchanged and has no pending edit
+journal, so edit the .txt files as before and compile again afterwards.
+"""
+import glob
+import os
+import sys
+from .wordbank import compile_bank
+
+def main(argv=None):
+    paths = (sys.argv[1:] if argv is None else argv) or sorted(glob.glob(os.path.join("WordBanks", "*.txt")))
+    for path in paths:
+        out = compile_bank(path)
+        print(f"Compiled '{path}' -> '{out}' ({os.path.getsize(out)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Row readers for bulk 'import' into a word bank.
+
+Rows are produced one at a time from an open text stream, so the source
+is never held in memory as a whole. Each row is a list of strings whose
+first item is the word.
+"""
+import csv
+import json
+import os
+
+FORMATS = {".csv": "csv", ".tsv": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+class ImportFileError(Exception):
+    pass
+
+def detect_format(filename):
+    fmt = FORMATS.get(os.path.splitext(filename)[1].lower())
+    if fmt is None:
+        raise ImportFileError(f"Unsupported import format for '{filename}' (use .csv, .tsv or .jsonl)")
+    return fmt
+
+def read_rows(stream, fmt, categories=()):
+    """Return (header, rows) for stream.
+
+    header is the column list when the source names its columns (a first
+    CSV/TSV row starting with 'word', or the keys of JSONL objects), else
+    None. rows yields (line_number, row) pairs.
+    """
+    if fmt in ("csv", "tsv"):
+        return _read_delimited(stream, "," if fmt == "csv" else "\t")
+    if fmt == "jsonl":
+        return _read_jsonl(stream, categories)
+    raise ImportFileError(f"Unknown import format '{fmt}'")
+
+def _read_delimited(stream, delimiter):
+    reader = csv.reader(stream, delimiter=delimiter)
+
+    def rows():
+        try:
+            for row in reader:
+                if any(row):
+                    yield reader.line_num, [cell.strip() for cell in row]
+        except csv.Error as e:
+            raise ImportFileError(f"Line {reader.line_num}: {e}")
+
+    rows = rows()
+    first = next(rows, None)
+    if first is None:
+        return None, iter(())
+    if first[1][0].lower() == "word":
+        return first[1], rows
+    return None, _chain(first, rows)
+
+def _read_jsonl(stream, categories):
+    lines = ((n, line) for n, line in enumerate(stream, 1) if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return None, iter(())
+    first_value = _decode(*first)
+    header = None
+    if isinstance(first_value, dict):
+        keys = [k for k in first_value if k != "word"]
+        header = ["word"] + (list(categories) if categories else keys)
+
+    def rows():
+        yield first[0], _row(first[0], first_value, header)
+        for n, line in lines:
+            yield n, _row(n, _decode(n, line), header)
+
+    return header, rows()
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+def _decode(n, line):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise ImportFileError(f"Line {n}: invalid JSON ({e.msg})")
+
+def _row(n, value, header):
+    if isinstance(value, str):
+        return [value.strip()]
+    if isinstance(value, list):
+        return [str(v).strip() for v in value]
+    if isinstance(value, dict):
+        if "word" not in value:
+            raise ImportFileError(f"Line {n}: missing 'word'")
+        if header is None:
+            raise ImportFileError(f"Line {n}: expected a list like the first line")
+        missing = [k for k in header if k not in value]
+        if missing:
+            raise ImportFileError(f"Line {n}: missing {', '.join(missing)}")
+        return [str(value[k]).strip() for k in header]
+    raise ImportFileError(f"Line {n}: expected an object, list or string")
@@ -1,9 +1,14 @@
 import os
 import random
-import json
-from .lexer import Lexer
-from .parser import Parser, ParserError
+from bisect import bisect_left
+from .parser import ParserError, compile_command
 from .ast_nodes import play, edit
+from . import candidates, scoring, solver
+from .results import CandidatesResult, CommandResult, GuessResult, ShowResult, SuggestResult, WordsResult
+from .importer import ImportFileError, detect_format, read_rows
+from .journal import COMPACT_OPS, Journal, discard_journal
+from .patterns import bank_patterns, discard_patterns
+from .wordbank import WordBank, WordBankError, bank_words, category_codes, load_bank, invalidate_bank, normalized_rows, write_bank
 
 class InterpreterError(Exception):
     pass
@@ -12,31 +17,73 @@ class Interpreter:
     def __init__(self):
         self.mode = "play"
         self.file_mode = "letters"
-        self.words = []
-        self.word_data = []
-        self.categories = []
+        self.bank = WordBank()
         self.secret = None
         self.secret_row = None
+        self.secret_index = None
+        self.guesses = []
         self.max_guesses = 6
         self.remaining_guesses = self.max_guesses
         self.current_file = None
         self.current_filename = None
+        self.journal = None
+        # (bank, file_mode, staged ops) while a begin/commit transaction is open
+        self.transaction = None
         self.hint_index = 0
-
-    def run_once(self, code: str):
-        lexer = Lexer(code)
-        tokens = []
-        while True:
-            tok = lexer.next_token()
-            tokens.append(tok)
-            if tok.type.name == "EOF":
-                break
+        # (BankMasks, bitset) of rows consistent with self.guesses, built on demand
+        self.candidate_bits = None
+        # random token the caller sets for each saved snapshot; see game_api.game_interpreter
+        self.revision = None
+
+    @property
+    def words(self):
+        return self.bank.words
+
+    @property
+    def word_data(self):
+        return self.bank.word_data
+
+    @property
+    def categories(self):
+        return self.bank.categories
+
+    def _writable_bank(self):
+        # shared banks are copied on the first edit
+        if self.bank.shared:
+            self.bank = self.bank.copy()
+        return self.bank
+
+    def run_once(self, code: str, structured: bool = False):
+        """Run one command.
+
+        With structured=True, guesses, 'show' and 'words' come back as
+        GuessResult, ShowResult and WordsResult objects; otherwise every
+        result is rendered to its text form.
+        """
         try:
-            parser = Parser(tokens, self.mode)
-            node = parser.parse()
-            return self.eval(node)
+            node = compile_command(self.mode, code)
+            result = self.eval(node)
         except ParserError as e:
             return f"Syntax Error: {e}"
+        if structured or isinstance(result, str):
+            return result
+        return str(result)
+
+    def run_many(self, commands, structured: bool = False):
+        """Run commands in order, returning a CommandResult for each non-blank one.
+
+        An exception fails only the command that raised it; the rest still run.
+        """
+        results = []
+        for code in commands:
+            code = code.strip()
+            if not code:
+                continue
+            try:
+                results.append(CommandResult(code, self.run_once(code, structured)))
+            except Exception as e:
+                results.append(CommandResult(code, error=e))
+        return results
 
     def eval(self, node):
         if isinstance(node, (play.Help, edit.Help)):
@@ -56,7 +103,9 @@ class Interpreter:
                 "word [<word>]          - Select or randomize a secret word",
                 "guess <word>           - Submit your guess",
                 "show                   - Display the current secret word",
-                "words                  - List all words in the current word bank",
+                "words [<offset> [<limit>]] [<prefix>] - List the bank's words in sorted order",
+                "suggest [<k>]          - Show the k most informative next guesses (letters mode)",
+                "candidates [<limit>]   - Count the words still consistent with the feedback",
                 "max_guesses <n>        - Set the maximum number of guesses",
                 "edit                   - Switch to edit mode",
                 "help                   - Show this help message",
@@ -74,6 +123,9 @@ class Interpreter:
                 return "Error: Word bank empty."
             self.secret = None
             self.secret_row = None
+            self.secret_index = None
+            self.guesses = []
+            self.candidate_bits = None
             self.hint_index = 0
             self.remaining_guesses = self.max_guesses
             if self.file_mode == "letters":
@@ -91,13 +143,16 @@ class Interpreter:
             if not self.words:
                 return "Error: Word bank empty."
             if node.word:
-                if node.word not in self.words:
+                idx = self.bank.lookup(node.word)
+                if idx is None:
                     return f"Error: Word '{node.word}' not in bank."
-                idx = self.words.index(node.word)
             else:
                 idx = random.randrange(len(self.words))
             self.secret = self.words[idx]
             self.secret_row = self.word_data[idx]
+            self.secret_index = idx
+            self.guesses = []
+            self.candidate_bits = None
             self.hint_index = 0
             self.remaining_guesses = self.max_guesses
             if self.file_mode == "hints":
@@ -115,42 +170,72 @@ class Interpreter:
                 return "Error: No secret word chosen."
             if self.remaining_guesses <= 0:
                 return "No guesses left."
-            if node.word not in self.words:
+            if node.word not in self.bank:
                 return f"Error: Word '{node.word}' not in bank." 
             self.remaining_guesses -= 1
-            feedback = self._make_feedback(node.word)
+            result = self._score(node.word)
+            result.remaining = self.remaining_guesses
             if node.word == self.secret:
-                win_msg = {"result": "win", "feedback": feedback}
+                result.result = "win"
+                result.secret = self.secret
                 if self.file_mode == "hints":
                     if self.hint_index < len(self.secret_row) - 1:
-                        win_msg["remaining_hints"] = []
+                        result.remaining_hints = []
                     while self.hint_index < len(self.secret_row) - 1:
                         self.hint_index += 1     
-                        win_msg["remaining_hints"].append(self.secret_row[self.hint_index])
+                        result.remaining_hints.append(self.secret_row[self.hint_index])
+                self._record_guess(result)
                 self.secret = None
                 self.secret_row = None
-                return json.dumps(win_msg)
+                return result
             extra = None
             if self.file_mode == "hints":
                 if len(self.secret_row) > 1:
                     if self.hint_index < len(self.secret_row) - 1:
                         self.hint_index += 1
                         extra = self.secret_row[self.hint_index]
-            result = {"feedback": feedback, "remaining": self.remaining_guesses}
-            result["result"] = "continue" if self.remaining_guesses > 0 else "lose"  
-            if extra:
-                result["hint"] = extra
-            return json.dumps(result)
+            result.hint = extra
+            if self.remaining_guesses <= 0:
+                result.result = "lose"
+                result.secret = self.secret
+            self._record_guess(result)
+            return result
 
         if isinstance(node, play.Show):
             if not self.secret:
                 return "No secret word chosen."
-            return f"The secret word is: {self.secret}"
+            return ShowResult(self.secret)
+
+        if isinstance(node, play.Suggest):
+            if not self.current_file:
+                return "Error: No word bank loaded."
+            if self.file_mode != "letters":
+                return "Error: 'suggest' only works in letters mode."
+            history = [(g[0], g[1]) for g in self.guesses]
+            patterns = bank_patterns(self.current_file, self.bank)
+            mask = candidates.to_mask(self._candidates(), len(self.bank))
+            picks, left = solver.suggest(self.bank, history, max(node.k, 1), patterns=patterns, mask=mask)
+            return SuggestResult(picks, left)
+
+        if isinstance(node, play.Candidates):
+            if not self.current_file:
+                return "Error: No word bank loaded."
+            bits = self._candidates()
+            rows = candidates.sample(bits, max(node.limit, 0))
+            return CandidatesResult(candidates.count(bits), [self.words[i] for i in rows.tolist()])
 
         if isinstance(node, play.Words):
             if not self.current_file:
                 return "Error: No word bank loaded."
-            return "Words: " + ", ".join(self.words)
+            words = self.bank.derived("sorted_words", lambda bank: sorted(bank_words(bank)))
+            lo, hi = 0, len(words)
+            if node.prefix:
+                lo = bisect_left(words, node.prefix)
+                # every string starting with prefix sorts below prefix + U+10FFFF
+                hi = bisect_left(words, node.prefix + "\U0010ffff", lo)
+            start = min(lo + node.offset, hi)
+            end = hi if node.limit is None else min(start + node.limit, hi)
+            return WordsResult(words[start:end], hi - lo, node.offset, node.limit, self.bank)
 
         if isinstance(node, play.MaxGuesses):
             self.max_guesses = node.n or 6
@@ -166,43 +251,118 @@ class Interpreter:
 
         return f"Unknown play command: {node}"
 
-    def _make_feedback(self, guess):
+    def _record_guess(self, result):
+        self.guesses.append([result.guess, list(result.feedback_codes), result.result, result.remaining, result.hint])
+        if self.candidate_bits is not None:
+            masks, bits = self.candidate_bits
+            masks.narrow(bits, self.file_mode, result.guess, result.feedback_codes)
+
+    def _candidates(self):
+        """Bitset of the rows consistent with every guess so far (see candidates.py)."""
+        masks = candidates.bank_masks(self.bank)
+        if self.candidate_bits is None or self.candidate_bits[0] is not masks:
+            # new game, restored game or changed bank: replay the guesses once
+            bits = masks.all.copy()
+            for g in self.guesses:
+                masks.narrow(bits, self.file_mode, g[0], g[1])
+            self.candidate_bits = (masks, bits)
+        return self.candidate_bits[1]
+
+    def snapshot(self):
+        """Return the game state as a small JSON-safe dict for restore()."""
+        return {
+            "file": self.current_filename,
+            "bank": list(self.bank.version) if self.bank.version else None,
+            "mode": self.mode,
+            "secret": self.secret_index,
+            "active": self.secret is not None,
+            "max_guesses": self.max_guesses,
+            "remaining": self.remaining_guesses,
+            "hint": self.hint_index,
+            "guesses": [list(g) for g in self.guesses],
+            "revision": self.revision,
+        }
+
+    def restore(self, state):
+        """Put the interpreter back in the state captured by snapshot().
+
+        Past guesses are taken from the snapshot as they are, not scored
+        again. Raises InterpreterError if the word bank changed since.
+        """
+        if state.get("file"):
+            if state.get("bank") is None:
+                raise InterpreterError("Snapshot was taken from an unsaved word bank")
+            loaded = self._load_file(state["file"])
+            if loaded.startswith("Error"):
+                raise InterpreterError(loaded)
+            if list(self.bank.version) != list(state["bank"]):
+                raise InterpreterError(f"Word bank '{state['file']}' changed since the snapshot")
+        else:
+            self.current_file = self.current_filename = None
+            self.bank = WordBank()
+            self.file_mode = "letters"
+        idx = state.get("secret")
+        if idx is not None and not 0 <= idx < len(self.words):
+            raise InterpreterError(f"Secret index {idx} out of range")
+        self.mode = state.get("mode", "play")
+        self.secret_index = idx
+        if idx is not None and state.get("active"):
+            self.secret = self.words[idx]
+            self.secret_row = self.word_data[idx]
+        else:
+            self.secret = None
+            self.secret_row = None
+        self.max_guesses = state.get("max_guesses", 6)
+        self.remaining_guesses = state.get("remaining", self.max_guesses)
+        self.hint_index = state.get("hint", 0)
+        self.guesses = [list(g) for g in state.get("guesses", [])]
+        self.candidate_bits = None
+        self.revision = state.get("revision")
+
+    def history(self):
+        """The current game's guesses as GuessResult objects, rebuilt without scoring."""
+        results = []
+        for word, codes, outcome, remaining, hint in self.guesses:
+            result = GuessResult(outcome, word, self.file_mode, tuple(codes), remaining, hint)
+            if self.file_mode == "categories":
+                result.categories = tuple(self.categories)
+                result.values = tuple(self.word_data[self.bank.lookup(word)][1:])
+            if outcome != "continue" and self.secret_index is not None:
+                result.secret = self.words[self.secret_index]
+            results.append(result)
+        return results
+
+    def _score(self, guess):
+        """Score guess against the secret; the caller fills in the game state."""
+        result = GuessResult("continue", guess, self.file_mode, ())
         if self.file_mode == "categories":
-            if guess not in self.words:
-                return ["❌ Word not in list."]
-            g_idx = self.words.index(guess)
-            g_row = self.word_data[g_idx]
-            feedback = []
-            for i in range(1, len(g_row)):
-                if i < len(self.secret_row) and g_row[i].strip().lower() == self.secret_row[i].strip().lower():
-                    feedback.append(f"{self.categories[i-1]}: ✅ ({g_row[i]})")
-                else:
-                    feedback.append(f"{self.categories[i-1]}: ❌ ({g_row[i]})")
-            return feedback
+            g_index = self.bank.lookup(guess)
+            g_row = self.word_data[g_index]
+            width = len(g_row) - 1
+            if self.secret_index is not None and self.word_data[self.secret_index] is self.secret_row:
+                columns, _ = category_codes(self.bank)
+                codes = scoring.score_columns(columns[g_index, :width], columns[self.secret_index, :width])
+                result.feedback_codes = tuple(codes.tolist())
+            else:
+                # the bank was edited since the secret was chosen
+                s_norm = [v.strip().lower() for v in self.secret_row]
+                g_norm = normalized_rows(self.bank)[g_index]
+                result.feedback_codes = tuple(
+                    scoring.CORRECT if i < len(s_norm) and g_norm[i] == s_norm[i] else scoring.ABSENT
+                    for i in range(1, len(g_row))
+                )
+            result.categories = tuple(self.categories)
+            result.values = tuple(g_row[1:])
         elif self.file_mode == "letters":
-            secret = self.secret
-            feedback = ["⬜"] * len(guess)
-            secret_counts = {}
-            # count letters in secret
-            for ch in secret:
-                secret_counts[ch] = secret_counts.get(ch, 0) + 1
-            # first pass: check 🟩
-            for i, ch in enumerate(guess):
-                if i < len(secret) and ch == secret[i]:
-                    feedback[i] = "🟩"
-                    secret_counts[ch] -= 1  # reduce available count
-            # second pass: check 🟨 only if letter still available and not already green
-            for i, ch in enumerate(guess):
-                if feedback[i] == "⬜" and ch in secret_counts and secret_counts[ch] > 0:
-                    feedback[i] = "🟨"
-                    secret_counts[ch] -= 1
-            return "".join(feedback)
+            result.feedback_codes = scoring.score_one(guess, self.secret)
         elif self.file_mode == "hints":
-            if guess == self.secret:
-                return f"✅ Correct! The word was '{self.secret}'."
-            else:
-                return "❌ Incorrect guess."
-        return "Invalid feedback mode."
+            result.feedback_codes = (scoring.CORRECT if guess == self.secret else scoring.ABSENT,)
+        return result
+
+    def _make_feedback(self, guess):
+        if self.file_mode == "categories" and guess not in self.bank:
+            return ["❌ Word not in list."]
+        return self._score(guess).feedback
 
     def _eval_edit(self, node):
         if isinstance(node, edit.Help):
@@ -214,14 +374,46 @@ class Interpreter:
                 "categories <cat1> | <cat2> | <cat3>          - Define categories (for categories mode)",
                 "add <word>                                   - Add a word (letters mode)",
                 "add <word> | <val1> | <val2> | <val3>        - Add a word with values or hints",
+                "import <source>                              - Add every row of a .csv, .tsv or .jsonl file in WordBanks",
                 "list                                         - Display all entries in the current file",
                 "edit <index> | <new values>                  - Edit a word entry",
                 "delete <index>                               - Delete a word by its index",
+                "begin                                        - Start a transaction (changes are saved on commit)",
+                "commit                                       - Save all changes made since 'begin'",
+                "rollback                                     - Discard all changes made since 'begin'",
                 "done                                         - Exit edit mode and return to play mode",
                 "help                                         - Show this help message",
             ]
             return "\n".join(lines)
 
+        if isinstance(node, (edit.Create, edit.File, edit.DeleteFile, edit.Done)) and self.transaction:
+            return "Error: Commit or roll back the open transaction first."
+
+        if isinstance(node, edit.Begin):
+            if not self.current_file:
+                return "Error: No file loaded."
+            if self.transaction:
+                return "Error: A transaction is already open."
+            bank = self.bank if self.bank.shared else self.bank.copy()
+            self.transaction = (bank, self.file_mode, [])
+            return "Transaction started. Changes are saved on 'commit'."
+
+        if isinstance(node, edit.Commit):
+            if not self.transaction:
+                return "Error: No open transaction."
+            ops = self.transaction[2]
+            self.transaction = None
+            if not ops:
+                return "Nothing to commit."
+            return f"Committed {len(ops)} change(s)\n" + self._save_file(*ops)
+
+        if isinstance(node, edit.Rollback):
+            if not self.transaction:
+                return "Error: No open transaction."
+            self.bank, self.file_mode, ops = self.transaction
+            self.transaction = None
+            return f"Rolled back {len(ops)} change(s)."
+
         if isinstance(node, edit.Create):
             return self._create_file(node.filename)
 
@@ -234,9 +426,9 @@ class Interpreter:
         if isinstance(node, edit.Categories):
             if not self.current_file:
                 return "Error: No file loaded."
-            self.categories = node.headers
+            self._writable_bank().categories = list(node.headers)
             self.file_mode = "categories"
-            return self._save_file()
+            return self._save_file({"op": "categories", "headers": list(node.headers)})
 
         if isinstance(node, edit.Add):
             if not self.current_file:
@@ -251,9 +443,21 @@ class Interpreter:
             if self.file_mode == "categories" and len(row) != expected_len:
                 return f"Error: Expected {expected_len} values (1 word + {len(self.categories)} categories), got {len(row)}"
 
-            self.word_data.append(row)
-            self.words.append(node.word)
-            return self._save_file()
+            self._writable_bank().append(row)
+            return self._save_file({"op": "add", "row": row})
+
+        if isinstance(node, edit.Import):
+            if not self.current_file:
+                return "Error: No file loaded."
+            filepath = os.path.join("WordBanks", node.source)
+            if not os.path.exists(filepath):
+                return f"Error: file '{node.source}' not found"
+            try:
+                fmt = detect_format(node.source)
+            except ImportFileError as e:
+                return f"Error: {e}"
+            with open(filepath, "r", encoding="utf-8", newline="") as f:
+                return self.import_rows(f, fmt)
 
         if isinstance(node, edit.ListWords):
             if not self.current_file:
@@ -273,21 +477,19 @@ class Interpreter:
                 return "Error: No file loaded."
             if node.index < 1 or node.index > len(self.word_data):
                 return f"Error: Index {node.index} out of range"
-            new_row = node.values
+            new_row = list(node.values)
             if self.categories and len(new_row) != len(self.categories) + 1:
                 return f"Error: Expected {len(self.categories) + 1} values, got {len(new_row)}"
-            self.word_data[node.index - 1] = new_row
-            self.words[node.index - 1] = new_row[0]
-            return self._save_file()
+            self._writable_bank().replace(node.index - 1, new_row)
+            return self._save_file({"op": "edit", "index": node.index - 1, "row": new_row})
 
         if isinstance(node, edit.Delete):
             if not self.current_file:
                 return "Error: No file loaded."
             if node.index < 1 or node.index > len(self.word_data):
                 return f"Error: Index {node.index} out of range"
-            removed = self.word_data.pop(node.index - 1)
-            self.words.pop(node.index - 1)
-            return f"Deleted word '{removed[0]}'\n" + self._save_file()
+            removed = self._writable_bank().pop(node.index - 1)
+            return f"Deleted word '{removed[0]}'\n" + self._save_file({"op": "delete", "index": node.index - 1})
 
         if isinstance(node, edit.Done):
             self.mode = "play"
@@ -295,6 +497,51 @@ class Interpreter:
 
         return f"Unknown edit command: {node}"
 
+    def import_rows(self, stream, fmt):
+        """Append every row read from stream to the current bank, or none of them.
+
+        fmt is "csv", "tsv" or "jsonl". All rows are validated before the
+        bank changes, and the result is saved in one write.
+        """
+        if not self.current_file:
+            return "Error: No file loaded."
+        categories = list(self.categories)
+        rows = []
+        try:
+            header, source = read_rows(stream, fmt, categories)
+            if header and len(header) > 1:
+                if categories:
+                    if [h.lower() for h in header[1:]] != [c.lower() for c in categories]:
+                        return f"Error: Import columns ({', '.join(header[1:])}) do not match categories ({', '.join(categories)})"
+                elif not self.words:
+                    categories = list(header[1:])
+            for n, row in source:
+                if not row or not row[0]:
+                    raise ImportFileError(f"Line {n}: missing word")
+                if any("|" in value or "\n" in value for value in row):
+                    raise ImportFileError(f"Line {n}: values cannot contain '|' or line breaks")
+                if categories and len(row) != len(categories) + 1:
+                    raise ImportFileError(f"Line {n}: expected {len(categories) + 1} values (1 word + {len(categories)} categories), got {len(row)}")
+                rows.append(row)
+        except (ImportFileError, UnicodeDecodeError) as e:
+            return f"Error: Nothing imported. {e}"
+        if not rows:
+            return "Nothing to import."
+
+        bank = self._writable_bank()
+        ops = []
+        if categories != list(bank.categories):
+            bank.categories = categories
+            ops.append({"op": "categories", "headers": categories, "mode": "categories"})
+        if categories:
+            self.file_mode = "categories"
+        elif self.file_mode == "letters" and any(len(row) > 1 for row in rows):
+            self.file_mode = "hints"
+        for row in rows:
+            bank.append(row)
+            ops.append({"op": "add", "row": row})
+        return f"Imported {len(rows)} entries\n" + self._save_file(*ops)
+
     def _create_file(self, filename):
         folder_path = os.path.join("WordBanks")
         os.makedirs(folder_path, exist_ok=True)
@@ -305,9 +552,11 @@ class Interpreter:
             return f"Error: file '{filename}' already exists"
         with open(filepath, "w", encoding="utf-8") as f:
             pass
+        discard_journal(filepath)
         self.current_file = filepath
         self.current_filename = filename
-        self.words, self.word_data, self.categories = [], [], []
+        self.journal = None
+        self.bank = WordBank()
         self.file_mode = "letters"
         return f"Created '{filename}' in letters mode (default)."
 
@@ -318,62 +567,47 @@ class Interpreter:
         
         if not os.path.exists(filepath):
             return f"Error: file '{filename}' not found"
-        with open(filepath, "r", encoding="utf-8") as f:
-            lines = [line.strip() for line in f if line.strip()]
-        if not lines:
-            self.words, self.word_data, self.categories = [], [], []
-            self.current_file = filepath
-            self.current_filename = filename
-            self.file_mode = "letters"
-            return f"Loaded file '{filename}' (empty)"
-        first_line = lines[0]
-        if "|" in first_line:
-            if first_line.lower().startswith("word |"):
-                file_mode = "categories"
-            else:
-                file_mode = "hints"
-        else:
-            file_mode = "letters"
-        self.words, self.word_data, self.categories = [], [], []
+        try:
+            bank = load_bank(filepath)
+        except WordBankError as e:
+            return f"Error: Invalid categories file '{filename}' ({e})"
+        self.bank = bank
         self.current_file = filepath
         self.current_filename = filename
-        self.file_mode = file_mode
-        if file_mode == "letters":
-            self.words = lines
-            self.word_data = [[w] for w in lines]
-        elif file_mode == "hints":
-            for line in lines:
-                parts = [p.strip() for p in line.split("|")]
-                self.word_data.append(parts)
-                self.words.append(parts[0])
-        elif file_mode == "categories":
-            headers = [h.strip() for h in lines[0].split("|")]
-            if headers[0].lower() != "word":
-                return f"Error: Invalid categories file '{filename}' (missing 'word' header)"
-            self.categories = headers[1:]
-            for line in lines[1:]:
-                parts = [p.strip() for p in line.split("|")]
-                if not parts or not parts[0]:
-                    continue
-                self.word_data.append(parts)
-                self.words.append(parts[0])
-        return f"Loaded file '{filename}' ({file_mode} mode, {len(self.words)} entries)"
-
-    def _save_file(self):
+        self.journal = None
+        self.file_mode = bank.mode
+        if bank.mode == "letters" and not bank.words:
+            return f"Loaded file '{filename}' (empty)"
+        return f"Loaded file '{filename}' ({bank.mode} mode, {len(bank.words)} entries)"
+
+    def _save_file(self, *ops):
+        """Persist the current bank.
+
+        Changes are appended to the file's journal in one write; the bank
+        file itself is only rewritten (atomically) when there are no ops
+        to log or the journal would grow past its compaction limit. Inside
+        a transaction the ops are only staged.
+        """
         if not self.current_file:
             return "Error: no file selected"
-        with open(self.current_file, "w", encoding="utf-8") as f:
-            if self.file_mode == "categories":
-                if self.categories:
-                    f.write("word | " + " | ".join(self.categories) + "\n")
-                for row in self.word_data:
-                    f.write(" | ".join(row) + "\n")
-            elif self.file_mode == "hints":
-                for row in self.word_data:
-                    f.write(" | ".join(row) + "\n")
-            elif self.file_mode == "letters":
-                for row in self.word_data:
-                    f.write(row[0] + "\n")
+        ops = [dict(op, mode=op.get("mode", self.file_mode)) for op in ops]
+        if self.transaction:
+            self.transaction[2].extend(ops)
+            return f"Staged ({len(self.transaction[2])} pending, 'commit' to save)"
+        self.bank.mode = self.file_mode
+        # any pattern matrix describes the old words
+        discard_patterns(self.current_file)
+        if self.journal is None:
+            self.journal = Journal(self.current_file)
+        if ops and self.journal.ops + len(ops) < COMPACT_OPS:
+            self.journal.append(ops)
+            compact = self.journal.needs_compaction()
+        else:
+            compact = True
+        if compact:
+            write_bank(self.current_file, self.bank)
+            self.journal = None
+        invalidate_bank(self.current_file)
         return f"Saved to '{self.current_filename}'"
 
     def _delete_file(self, filename):
@@ -383,6 +617,9 @@ class Interpreter:
         if not os.path.exists(filepath):
             return f"Error: file '{filename}' does not exist"
         os.remove(filepath)
+        discard_journal(filepath)
+        discard_patterns(filepath)
+        invalidate_bank(filepath)
         if self.current_file == filename:
-            self.current_file, self.words, self.word_data, self.categories = None, [], [], []
+            self.current_file, self.bank = None, WordBank()
         return f"Deleted file '{filename}'"
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""Append-only change journal for word banks edited in edit mode.
+
+Edits are appended to "<bank>.journal" as JSON lines instead of rewriting
+the bank. The first line records which base file the journal applies to
+(inode, mtime, size); a journal whose base no longer matches is ignored,
+so a crash between compaction and journal removal cannot apply changes
+twice. A torn last line from a crash mid-append is ignored as well.
+"""
+import json
+import os
+
+JOURNAL_SUFFIX = ".journal"
+
+# compact the journal into the bank file once it passes either limit
+COMPACT_OPS = 1000
+COMPACT_BYTES = 1 << 20
+
+def journal_path(bank_path):
+    return bank_path + JOURNAL_SUFFIX
+
+def base_id(bank_path):
+    st = os.stat(bank_path)
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+def discard_journal(bank_path):
+    try:
+        os.remove(journal_path(bank_path))
+    except FileNotFoundError:
+        pass
+
+def _scan(bank_path):
+    """(ops, end) for the journal of bank_path.
+
+    ops are the entries that apply to the current bank file, in order, and
+    end is the byte offset just past the last whole entry; end is 0 if the
+    journal is missing or was written for another base.
+    """
+    try:
+        with open(journal_path(bank_path), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+    lines = data.split(b"\n")
+    try:
+        header = json.loads(lines[0])
+    except ValueError:
+        return [], 0
+    if len(lines) < 2 or not isinstance(header, dict) or header.get("base") != base_id(bank_path):
+        return [], 0
+    ops, end = [], len(lines[0]) + 1
+    # the last piece has no newline after it: empty, or torn by a crash
+    for line in lines[1:-1]:
+        if line:
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                break  # torn write from a crash; nothing after it was committed
+        end += len(line) + 1
+    return ops, end
+
+def read_ops(bank_path):
+    """Journal entries that apply to the current bank file, in order."""
+    return _scan(bank_path)[0]
+
+def apply_op(bank, op):
+    """Apply one journal entry to a writable WordBank."""
+    kind = op["op"]
+    if kind == "add":
+        bank.append(list(op["row"]))
+    elif kind == "edit":
+        bank.replace(op["index"], list(op["row"]))
+    elif kind == "delete":
+        bank.pop(op["index"])
+    elif kind == "categories":
+        bank.categories = list(op["headers"])
+    bank.mode = op["mode"]
+
+class Journal:
+    """Appender for one bank's journal."""
+
+    def __init__(self, bank_path):
+        self.bank_path = bank_path
+        self.path = journal_path(bank_path)
+        self._sync()
+
+    def _sync(self):
+        # reread the journal and cut off a torn tail, so appends start on a fresh line
+        ops, end = _scan(self.bank_path)
+        self.base = base_id(self.bank_path)
+        self.ops = len(ops)
+        self.size = end
+        if end and os.path.getsize(self.path) > end:
+            os.truncate(self.path, end)
+
+    def append(self, ops):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = None
+        if size != self.size or base_id(self.bank_path) != self.base:
+            # another interpreter appended, compacted or removed the journal since
+            self._sync()
+        lines = [json.dumps(op) for op in ops]
+        if not self.size:
+            # start fresh, dropping any journal left over for an older base
+            lines.insert(0, json.dumps({"base": self.base}))
+            mode = "w"
+        else:
+            mode = "a"
+        data = "\n".join(lines) + "\n"
+        with open(self.path, mode, encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.ops += len(ops)
+        self.size += len(data.encode("utf-8"))
+
+    def needs_compaction(self):
+        return self.ops >= COMPACT_OPS or self.size >= COMPACT_BYTES
@@ -20,46 +20,50 @@ class Token:
 class LexerError(Exception): 
     pass
 
+# Alternatives are tried left to right, so the order matches the old
+# one-pattern-at-a-time lexer; WS is matched and dropped.
+TOKEN_REGEX = re.compile(r"""
+    (?P<WS>\s+)
+  | (?P<PIPE>\|)
+  | (?P<INT>\d+)
+  | (?P<STRING>"(?:[^"\\]|\\.)*")
+  | (?P<IDENT>[A-Za-z_][A-Za-z0-9_./\\-]*)
+""", re.VERBOSE)
+
+_TOKEN_TYPES = {
+    "PIPE": TokenType.PIPE,
+    "INT": TokenType.INT,
+    "STRING": TokenType.STRING,
+    "IDENT": TokenType.IDENT,
+}
+
 class Lexer:
     def __init__(self, src: str):
         self.src = src
         self.pos = 0
 
-        self.regex_patterns = [
-            (r'\s+', None),                
-            (r'\|', TokenType.PIPE),       
-            (r'\d+', TokenType.INT),      
-            (r'"([^"\\]|\\.)*"', TokenType.STRING),  
-            (r'[A-Za-z_][A-Za-z0-9_./\\-]*', TokenType.IDENT), 
-        ]
-
     def next_token(self):
-        if self.pos >= len(self.src):
-            return Token(TokenType.EOF, "")
-
-        for pattern, ttype in self.regex_patterns:
-            regex = re.compile(pattern)
-            m = regex.match(self.src, self.pos)
-            if m:
-                text = m.group(0)
-                self.pos = m.end()
-
-                if not ttype:  # skips whitespace
-                    return self.next_token()
-
-                if ttype == TokenType.STRING:
-                    text = text[1:-1]  
-                    text = text.replace('\\"', '"').replace('\\\\', '\\')
-
-                return Token(ttype, text)
-
-        raise LexerError(f"Unexpected character at: {self.src[self.pos:]}")
+        src = self.src
+        match = TOKEN_REGEX.match
+        while self.pos < len(src):
+            m = match(src, self.pos)
+            if not m:
+                raise LexerError(f"Unexpected character at: {src[self.pos:]}")
+            self.pos = m.end()
+            kind = m.lastgroup
+            if kind == "WS":
+                continue
+            text = m.group()
+            if kind == "STRING":
+                text = text[1:-1]
+                text = text.replace('\\"', '"').replace('\\\\', '\\')
+            return Token(_TOKEN_TYPES[kind], text)
+        return Token(TokenType.EOF, "")
 
     def tokens(self):
-        toks = []
+        """Yield tokens up to and including EOF."""
         while True:
             tok = self.next_token()
-            toks.append(tok)
+            yield tok
             if tok.type == TokenType.EOF:
-                break
-        return toks
\ No newline at end of file
+                return
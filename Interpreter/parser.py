@@ -1,5 +1,6 @@
+from functools import lru_cache
 from typing import List
-from .lexer import Token, TokenType
+from .lexer import Lexer, Token, TokenType
 from .ast_nodes import play, edit
 
 class ParserError(Exception):
@@ -11,32 +12,6 @@ class Parser:
         self.pos = 0
         self.mode = mode.lower() if mode in ("play", "edit") else "play"
 
-        self.play_cmds = {
-            "file": lambda: play.File(self._expect(TokenType.IDENT).text),
-            "start": lambda: play.Start(),
-            "word": self._parse_word,
-            "words": lambda: play.Words(),
-            "max_guesses": lambda: play.MaxGuesses(int(self._expect(TokenType.INT).text)),
-            "guess": lambda: play.Guess(self._expect(TokenType.IDENT).text),
-            "show": lambda: play.Show(),
-            "edit": lambda: play.Edit(),
-            "help": lambda: play.Help(),
-            "quit": lambda: play.Quit(),
-        }
-
-        self.edit_cmds = {
-            "create": self._parse_create,
-            "file": lambda: edit.File(self._expect(TokenType.IDENT).text),
-            "deletefile": lambda: edit.DeleteFile(self._expect(TokenType.IDENT).text),
-            "categories": self._parse_categories,
-            "add": self._parse_add,
-            "list": lambda: edit.ListWords(),
-            "edit": self._parse_edit,
-            "delete": lambda: edit.Delete(int(self._expect(TokenType.INT).text)),
-            "done": lambda: edit.Done(),
-            "help": lambda: edit.Help(),
-        }
-
     def _peek(self):
         return self.tokens[self.pos] if self.pos < len(self.tokens) else Token(TokenType.EOF, "")
 
@@ -62,9 +37,9 @@ class Parser:
             return edit.Help() if self.mode == "edit" else play.Help()
 
         if self.mode == "play" and cmd_name in self.play_cmds:
-            return self.play_cmds[cmd_name]()
+            return self.play_cmds[cmd_name](self)
         if self.mode == "edit" and cmd_name in self.edit_cmds:
-            return self.edit_cmds[cmd_name]()
+            return self.edit_cmds[cmd_name](self)
 
         raise ParserError(f"Unknown command '{cmd_name}' in {self.mode} mode")
 
@@ -74,6 +49,15 @@ class Parser:
             return play.Word(self._advance().text)
         return play.Word()
 
+    def _parse_words(self):
+        numbers = []
+        while self._peek().type == TokenType.INT and len(numbers) < 2:
+            numbers.append(int(self._advance().text))
+        prefix = None
+        if self._peek().type in (TokenType.IDENT, TokenType.STRING):
+            prefix = self._advance().text
+        return play.Words(*numbers, prefix=prefix)
+
     def _parse_categories(self):
         headers = []
         while True:
@@ -106,6 +90,12 @@ class Parser:
             self._advance()
         return edit.Create(filename_tok.text)
     
+    def _parse_import(self):
+        tok = self._peek()
+        if tok.type == TokenType.STRING:
+            return edit.Import(self._advance().text)
+        return edit.Import(self._expect(TokenType.IDENT).text)
+
     def _parse_edit(self):
         index_tok = self._expect(TokenType.INT)
         values = []
@@ -117,4 +107,46 @@ class Parser:
                 self._advance()
             else:
                 break
-        return edit.Edit(int(index_tok.text), values)
\ No newline at end of file
+        return edit.Edit(int(index_tok.text), values)
+
+    # Dispatch tables are built once with the class; entries take the parser.
+    play_cmds = {
+        "file": lambda self: play.File(self._expect(TokenType.IDENT).text),
+        "start": lambda self: play.Start(),
+        "word": _parse_word,
+        "words": _parse_words,
+        "suggest": lambda self: play.Suggest(*([int(self._advance().text)] if self._peek().type == TokenType.INT else [])),
+        "candidates": lambda self: play.Candidates(*([int(self._advance().text)] if self._peek().type == TokenType.INT else [])),
+        "max_guesses": lambda self: play.MaxGuesses(int(self._expect(TokenType.INT).text)),
+        "guess": lambda self: play.Guess(self._expect(TokenType.IDENT).text),
+        "show": lambda self: play.Show(),
+        "edit": lambda self: play.Edit(),
+        "help": lambda self: play.Help(),
+        "quit": lambda self: play.Quit(),
+    }
+
+    edit_cmds = {
+        "create": _parse_create,
+        "file": lambda self: edit.File(self._expect(TokenType.IDENT).text),
+        "deletefile": lambda self: edit.DeleteFile(self._expect(TokenType.IDENT).text),
+        "categories": _parse_categories,
+        "add": _parse_add,
+        "import": _parse_import,
+        "list": lambda self: edit.ListWords(),
+        "edit": _parse_edit,
+        "delete": lambda self: edit.Delete(int(self._expect(TokenType.INT).text)),
+        "begin": lambda self: edit.Begin(),
+        "commit": lambda self: edit.Commit(),
+        "rollback": lambda self: edit.Rollback(),
+        "done": lambda self: edit.Done(),
+        "help": lambda self: edit.Help(),
+    }
+
+@lru_cache(maxsize=1024)
+def compile_command(mode: str, src: str):
+    """Lex and parse one command into its AST node.
+
+    Results are cached per (mode, source), so the returned node is shared
+    and must not be mutated.
+    """
+    return Parser(list(Lexer(src).tokens()), mode).parse()
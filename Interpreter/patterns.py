@@ -0,0 +1,101 @@
+"""Precomputed feedback-pattern matrices for letters banks.
+
+    python -m Interpreter.patterns [bank.txt ...]
+
+writes <bank>.patterns next to each letters bank (default: every
+WordBanks/*.txt): an n x n matrix whose [g, s] cell is the base-3 packed
+feedback (scoring.pack) for guessing word g when word s is the secret.
+The file is memory-mapped read-only, so every process shares one copy
+through the page cache. Its header records the bank version it was built
+from; edit-mode saves delete it and a stale one is ignored.
+"""
+import glob
+import os
+import struct
+import sys
+import numpy as np
+from . import scoring
+from .wordbank import bank_words, load_bank
+
+PATTERNS_SUFFIX = ".patterns"
+_MAGIC = b"LXPAT001"
+# magic, rows, word width, item size, then the four bank_version() fields
+_HEADER = struct.Struct("<8sqqqqqqq")
+_DATA_OFFSET = 64
+
+# guess x secret pairs scored per step while building
+_PAIR_BUDGET = 1 << 22
+
+def patterns_path(bank_path):
+    return bank_path + PATTERNS_SUFFIX
+
+def discard_patterns(bank_path):
+    try:
+        os.remove(patterns_path(bank_path))
+    except FileNotFoundError:
+        pass
+
+def _dtype(width):
+    return scoring.pack(np.zeros((1, width), dtype=np.uint8)).dtype
+
+def build_patterns(bank_path):
+    """Compute and write bank_path's pattern matrix; returns the file path."""
+    bank = load_bank(bank_path)
+    if bank.mode != "letters":
+        raise ValueError(f"'{bank_path}' is not a letters bank")
+    words = list(bank_words(bank))
+    width = len(words[0]) if words else 0
+    if any(len(w) != width for w in words):
+        raise ValueError(f"'{bank_path}' has words of different lengths")
+    codes = scoring.encode(words, width)
+    n = len(words)
+    dtype = _dtype(width)
+    path = patterns_path(bank_path)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, n, width, dtype.itemsize, *bank.version).ljust(_DATA_OFFSET, b"\0"))
+    if n:
+        matrix = np.memmap(tmp, dtype, "r+", _DATA_OFFSET, (n, n))
+        rows = max(1, _PAIR_BUDGET // n)
+        for start in range(0, n, rows):
+            g = codes[start:start + rows]
+            matrix[start:start + len(g)] = scoring.pack(scoring.score(g[:, None, :], codes[None, :, :]))
+        matrix.flush()
+        del matrix
+    os.replace(tmp, path)
+    return path
+
+def load_patterns(bank_path, bank):
+    """Read-only memmap of the matrix built for this version of bank, or None."""
+    if bank.version is None:
+        return None
+    path = patterns_path(bank_path)
+    try:
+        with open(path, "rb") as f:
+            header = _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, struct.error):
+        return None
+    magic, n, width, itemsize, *version = header
+    if magic != _MAGIC or tuple(version) != tuple(bank.version) or n != len(bank):
+        return None
+    dtype = _dtype(width)
+    if dtype.itemsize != itemsize or n == 0:
+        return None
+    return np.memmap(path, dtype, "r", _DATA_OFFSET, (n, n))
+
+def bank_patterns(bank_path, bank):
+    """load_patterns(), looked up once per loaded bank."""
+    return bank.derived("patterns", lambda b: [load_patterns(bank_path, b)])[0]
+
+def main(argv=None):
+    paths = (sys.argv[1:] if argv is None else argv) or sorted(glob.glob(os.path.join("WordBanks", "*.txt")))
+    for path in paths:
+        try:
+            out = build_patterns(path)
+        except ValueError as e:
+            print(f"Skipped: {e}")
+            continue
+        print(f"Built '{out}' ({os.path.getsize(out)} bytes)")
+
+if __name__ == "__main__":
+    main()
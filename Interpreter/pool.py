@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from .interpreter import Interpreter
+
+class _Entry:
+    __slots__ = ("interp", "lock", "last_used", "users")
+
+    def __init__(self, interp):
+        self.interp = interp
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        # checkouts holding or waiting for lock; such entries are never evicted
+        self.users = 0
+
+class InterpreterPool:
+    """Interpreters keyed by (session id, game), evicted by LRU order and idle TTL."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 1800.0, factory=Interpreter):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.factory = factory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _get_entry(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self.factory())
+            else:
+                self._entries.move_to_end(key)
+            entry.users += 1
+            entry.last_used = now
+            self._evict_oldest()
+            return entry
+
+    def _evict_oldest(self):
+        # past max_size, drop least recently used entries that nobody has checked out
+        excess = len(self._entries) - self.max_size
+        if excess <= 0:
+            return
+        idle = []
+        for key, entry in self._entries.items():
+            if len(idle) == excess:
+                break
+            if not entry.users:
+                idle.append(key)
+        for key in idle:
+            del self._entries[key]
+
+    def _evict_idle(self, now):
+        # entries are kept in access order, so idle ones sit at the front
+        idle = []
+        for key, entry in self._entries.items():
+            if now - entry.last_used < self.ttl:
+                break
+            if not entry.users:
+                idle.append(key)
+        for key in idle:
+            del self._entries[key]
+
+    @contextmanager
+    def checkout(self, session_id: str, game: str):
+        """Yield the interpreter for this session and game, locked for the caller."""
+        entry = self._get_entry((session_id, game))
+        try:
+            with entry.lock:
+                yield entry.interp
+        finally:
+            with self._lock:
+                entry.users -= 1
+
+    def discard(self, session_id: str, game: str):
+        with self._lock:
+            self._entries.pop((session_id, game), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,124 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+from . import scoring
+
+@dataclass
+class CommandResult:
+    """Outcome of one command in Interpreter.run_many."""
+    command: str
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+def format_feedback(mode, guess, codes, categories=(), values=()):
+    """Render feedback codes the way the interpreter has always printed them."""
+    if mode == "categories":
+        return [
+            f"{category}: {'✅' if code == scoring.CORRECT else '❌'} ({value})"
+            for category, value, code in zip(categories, values, codes)
+        ]
+    if mode == "letters":
+        return scoring.render(codes)
+    if mode == "hints":
+        if codes and codes[0] == scoring.CORRECT:
+            return f"✅ Correct! The word was '{guess}'."
+        return "❌ Incorrect guess."
+    return "Invalid feedback mode."
+
+@dataclass
+class GuessResult:
+    """A scored guess.
+
+    feedback_codes holds scoring.ABSENT/PRESENT/CORRECT per letter in
+    letters mode, per column in categories mode, and a single code in
+    hints mode. secret is only filled in once the game is over.
+    """
+    result: str
+    guess: str
+    mode: str
+    feedback_codes: Tuple[int, ...]
+    remaining: int = 0
+    hint: Optional[str] = None
+    remaining_hints: Optional[List[str]] = None
+    secret: Optional[str] = None
+    categories: Tuple[str, ...] = ()
+    values: Tuple[str, ...] = ()
+
+    @property
+    def feedback(self):
+        return format_feedback(self.mode, self.guess, self.feedback_codes, self.categories, self.values)
+
+    def to_dict(self):
+        """The JSON payload the guess command has always produced."""
+        if self.result == "win":
+            data = {"result": "win", "feedback": self.feedback}
+            if self.remaining_hints is not None:
+                data["remaining_hints"] = list(self.remaining_hints)
+            return data
+        data = {"feedback": self.feedback, "remaining": self.remaining, "result": self.result}
+        if self.hint:
+            data["hint"] = self.hint
+        return data
+
+    def __str__(self):
+        return json.dumps(self.to_dict())
+
+@dataclass
+class ShowResult:
+    secret: str
+
+    def __str__(self):
+        return f"The secret word is: {self.secret}"
+
+@dataclass
+class WordsResult:
+    """One page of the bank's words in sorted order; total counts every match.
+
+    bank is the WordBank the words came from, for callers that need the
+    rest of their rows.
+    """
+    words: List[str] = field(default_factory=list)
+    total: Optional[int] = None
+    offset: int = 0
+    limit: Optional[int] = None
+    bank: Any = field(default=None, repr=False, compare=False)
+
+    @property
+    def complete(self):
+        return self.total is None or len(self.words) == self.total
+
+    def __str__(self):
+        if not self.words and self.total:
+            return f"Words: none past {self.offset} ({self.total} total)"
+        text = "Words: " + ", ".join(self.words)
+        if not self.complete:
+            text += f" ({self.offset + 1}-{self.offset + len(self.words)} of {self.total})"
+        return text
+
+@dataclass
+class SuggestResult:
+    """Best next guesses as (word, expected bits of information), and how many words are still possible."""
+    suggestions: List[Tuple[str, float]]
+    candidates: int
+
+    def __str__(self):
+        picks = ", ".join(f"{word} ({bits:.2f} bits)" for word, bits in self.suggestions)
+        return f"Suggested guesses ({self.candidates} words left): {picks or 'none'}"
+
+@dataclass
+class CandidatesResult:
+    """How many bank words are still consistent with the game's feedback, and the first few of them."""
+    count: int
+    sample: List[str]
+
+    def __str__(self):
+        text = f"Candidates ({self.count} words left)"
+        if self.sample:
+            text += ": " + ", ".join(self.sample)
+            if len(self.sample) < self.count:
+                text += ", ..."
+        return text
@@ -0,0 +1,126 @@
+"""Vectorized letters-mode scoring.
+
+Words are encoded as rows of Unicode code points (padded with 0), and
+feedback is an array of per-position codes: ABSENT, PRESENT or CORRECT.
+The emoji string is only produced by render().
+"""
+import numpy as np
+
+ABSENT, PRESENT, CORRECT = 0, 1, 2
+SYMBOLS = ("⬜", "🟨", "🟩")
+
+# Stand-ins for letters already used by a green match. They are outside
+# the Unicode range, so they never equal a real letter or each other.
+_USED_GUESS = np.uint32(0xFFFFFFFE)
+_USED_SECRET = np.uint32(0xFFFFFFFF)
+
+def encode(words, width=None):
+    """Encode a list of words as an (n, width) uint32 array of code points."""
+    words = list(words)
+    if width is None:
+        width = max((len(w) for w in words), default=0)
+    if all(len(w) == width for w in words):
+        text = "".join(words)
+    else:
+        text = "".join(w[:width].ljust(width, "\0") for w in words)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    return codes.reshape(len(words), width).astype(np.uint32, copy=False)
+
+def score(guesses, secrets):
+    """Score encoded guesses against encoded secrets.
+
+    Both arguments are code-point arrays whose leading dimensions broadcast
+    and whose last dimension is the word width. Returns uint8 codes of the
+    broadcast shape. Duplicate letters follow _make_feedback: greens first,
+    then yellows left to right while unmatched secret letters remain.
+    """
+    g, s = np.broadcast_arrays(np.asarray(guesses, dtype=np.uint32), np.asarray(secrets, dtype=np.uint32))
+    green = g == s
+    g_open = np.where(green, _USED_GUESS, g)
+    s_open = np.where(green, _USED_SECRET, s)
+    codes = green.astype(np.uint8) * CORRECT
+    width = g.shape[-1]
+    # Words are short, so loop over positions and keep every step a flat
+    # vector operation across all pairs.
+    for i in range(width):
+        letter = g_open[..., i]
+        # unmatched secret letters equal to this guess letter...
+        available = np.zeros(letter.shape, dtype=np.int16)
+        for j in range(width):
+            available += letter == s_open[..., j]
+        # ...minus earlier unmatched guess positions that already claimed one
+        for j in range(i):
+            available -= letter == g_open[..., j]
+        codes[..., i][(available > 0) & ~green[..., i]] = PRESENT
+    return codes
+
+def score_columns(guesses, secrets):
+    """Categories feedback from category_codes() rows.
+
+    A column is CORRECT when both codes are equal and present (>= 0).
+    Arguments broadcast like score(), so one guess can be scored against
+    many secrets at once.
+    """
+    g, s = np.broadcast_arrays(np.asarray(guesses), np.asarray(secrets))
+    return np.where((g == s) & (s >= 0), CORRECT, ABSENT).astype(np.uint8)
+
+def pack(codes):
+    """Pack per-position codes into one base-3 integer per word (position i has weight 3**i)."""
+    codes = np.asarray(codes)
+    width = codes.shape[-1]
+    if width <= 5:
+        dtype = np.uint8
+    elif width <= 10:
+        dtype = np.uint16
+    elif width <= 20:
+        dtype = np.uint32
+    else:
+        dtype = np.uint64
+    weights = (3 ** np.arange(width, dtype=np.uint64)).astype(dtype)
+    return (codes.astype(dtype) * weights).sum(axis=-1, dtype=dtype)
+
+def unpack(packed, width):
+    """Inverse of pack() for a single packed code."""
+    packed = int(packed)
+    codes = []
+    for _ in range(width):
+        packed, code = divmod(packed, 3)
+        codes.append(code)
+    return np.array(codes, dtype=np.uint8)
+
+def render(codes, length=None):
+    """Render one row of codes as the emoji feedback string."""
+    if length is not None:
+        codes = codes[:length]
+    return "".join(SYMBOLS[c] for c in codes)
+
+def score_one(guess: str, secret: str):
+    """Codes for a single guess, trimmed to the guess length, as a tuple.
+
+    A plain loop: for one pair it is far cheaper than building arrays.
+    """
+    codes = [ABSENT] * len(guess)
+    counts = {}
+    for ch in secret:
+        counts[ch] = counts.get(ch, 0) + 1
+    for i, ch in enumerate(guess):
+        if i < len(secret) and ch == secret[i]:
+            codes[i] = CORRECT
+            counts[ch] -= 1
+    for i, ch in enumerate(guess):
+        if codes[i] == ABSENT and counts.get(ch, 0) > 0:
+            codes[i] = PRESENT
+            counts[ch] -= 1
+    return tuple(codes)
+
+def score_many(guesses, secret: str):
+    """Codes for many guesses against one secret, shape (len(guesses), width)."""
+    guesses = list(guesses)
+    width = max([len(secret)] + [len(g) for g in guesses])
+    return score(encode(guesses, width), encode([secret], width)[0])
+
+def score_against(guess: str, secrets):
+    """Codes for one guess against many secrets, shape (len(secrets), width)."""
+    secrets = list(secrets)
+    width = max([len(guess)] + [len(s) for s in secrets])
+    return score(encode([guess], width)[0], encode(secrets, width))
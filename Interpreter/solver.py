@@ -0,0 +1,141 @@
+"""Letters-mode guess suggestions.
+
+A guess is rated by the entropy (in bits) of the feedback it would get
+across the words still consistent with the game so far: the higher it
+is, the more the answer is expected to narrow the candidates down.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from . import scoring
+from .wordbank import bank_words
+
+# guess x secret pairs scored per step; bounds the temporary arrays
+_PAIR_BUDGET = 1 << 20
+
+def word_codes(bank):
+    """scoring.encode() of the bank's words, cached on the bank."""
+    return bank.derived("letter_codes", lambda b: scoring.encode(bank_words(b)))
+
+def consistent(codes, guesses):
+    """Mask of encoded words that would have given every (guess, feedback) pair."""
+    mask = np.ones(len(codes), dtype=bool)
+    for guess, feedback in guesses:
+        width = codes.shape[1]
+        if len(guess) > width:
+            return np.zeros(len(codes), dtype=bool)
+        got = scoring.score(scoring.encode([guess], width)[0], codes)[:, :len(guess)]
+        mask &= (got == np.asarray(feedback, dtype=np.uint8)).all(axis=1)
+    return mask
+
+def _row_entropy(packed, size):
+    """Entropy of each row of packed patterns (values below size)."""
+    c, m = packed.shape
+    keys = (packed.astype(np.int64) + np.arange(c, dtype=np.int64)[:, None] * size).ravel()
+    if c * size <= 1 << 24:
+        p = np.bincount(keys, minlength=c * size).reshape(c, size) / m
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return -np.where(p > 0, p * np.log2(p), 0).sum(axis=1)
+    # too many possible patterns for a dense table; count the ones that occur
+    uniq, counts = np.unique(keys, return_counts=True)
+    p = counts / m
+    return -np.bincount(uniq // size, weights=p * np.log2(p), minlength=c)
+
+def pattern_entropy(guesses, secrets):
+    """Entropy of the feedback pattern of each encoded guess over equally likely secrets."""
+    n, width = guesses.shape
+    m = len(secrets)
+    entropy = np.zeros(n)
+    if m == 0 or n == 0:
+        return entropy
+    rows = max(1, min(n, _PAIR_BUDGET // m))
+    for start in range(0, n, rows):
+        g = guesses[start:start + rows]
+        packed = scoring.pack(scoring.score(g[:, None, :], secrets[None, :, :]))
+        entropy[start:start + len(g)] = _row_entropy(packed, 3 ** width)
+    return entropy
+
+def matrix_entropy(matrix, width, candidates=None):
+    """pattern_entropy() read from a precomputed pattern matrix (see patterns.py)."""
+    n = len(matrix)
+    m = n if candidates is None else len(candidates)
+    entropy = np.zeros(n)
+    if m == 0:
+        return entropy
+    rows = max(1, min(n, _PAIR_BUDGET // m))
+    for start in range(0, n, rows):
+        block = matrix[start:start + rows]
+        if candidates is not None:
+            block = block[:, candidates]
+        entropy[start:start + len(block)] = _row_entropy(np.asarray(block), 3 ** width)
+    return entropy
+
+def _matrix_consistent(matrix, bank, guesses):
+    """consistent() from matrix rows, or None if a guess is not a full-width bank word."""
+    width = len(bank.words[0])
+    mask = np.ones(len(matrix), dtype=bool)
+    for guess, feedback in guesses:
+        g = bank.lookup(guess)
+        if g is None or len(feedback) != width:
+            return None
+        mask &= np.asarray(matrix[g]) == scoring.pack(np.asarray(feedback, dtype=np.uint8))
+    return mask
+
+# (workers, executor), created on first use
+_executor = None
+
+def _pool(workers):
+    global _executor
+    if _executor is None or _executor[0] != workers:
+        if _executor is not None:
+            _executor[1].shutdown(wait=False)
+        _executor = (workers, ProcessPoolExecutor(max_workers=workers))
+    return _executor[1]
+
+def rank(guesses, secrets, workers=0):
+    """pattern_entropy(), split across a process pool when workers > 1."""
+    if workers <= 1 or len(guesses) * len(secrets) < 4 * _PAIR_BUDGET:
+        return pattern_entropy(guesses, secrets)
+    parts = np.array_split(guesses, workers)
+    return np.concatenate(list(_pool(workers).map(pattern_entropy, parts, [secrets] * len(parts))))
+
+def default_workers():
+    """Process count from LEXIS_SUGGEST_WORKERS (0 or unset: score in-process)."""
+    try:
+        return int(os.environ.get("LEXIS_SUGGEST_WORKERS", "0"))
+    except ValueError:
+        return 0
+
+def suggest(bank, guesses, k=5, workers=None, patterns=None, mask=None):
+    """Top k (word, bits) guesses given past (guess, feedback) pairs, and the candidate count.
+
+    patterns is the bank's pattern matrix, when one has been built; it
+    replaces scoring with table lookups. mask, if given, is the bool mask
+    of words consistent with guesses, already worked out by the caller.
+    """
+    if workers is None:
+        workers = default_workers()
+    if mask is None and patterns is not None:
+        mask = _matrix_consistent(patterns, bank, guesses)
+    if patterns is None:
+        codes = word_codes(bank)
+    if mask is None:
+        mask = consistent(word_codes(bank), guesses)
+    candidates = np.flatnonzero(mask)
+    if len(candidates) <= 2:
+        # nothing left to learn; guess one of them
+        return [(bank.words[i], 0.0) for i in candidates[:k]], len(candidates)
+    if patterns is not None:
+        width = len(bank.words[0])
+        if guesses:
+            entropy = matrix_entropy(patterns, width, candidates)
+        else:
+            entropy = bank.derived("opening_entropy", lambda b: matrix_entropy(patterns, width))
+    elif guesses:
+        entropy = rank(codes, codes[candidates], workers)
+    else:
+        # the opening ranking is the same for every game on this bank
+        entropy = bank.derived("opening_entropy", lambda b: rank(codes, codes, workers))
+    # best first; among equals prefer words that can still win, then bank order
+    order = np.lexsort((np.arange(len(entropy)), ~mask, -entropy))
+    return [(bank.words[i], float(entropy[i])) for i in order[:k]], len(candidates)
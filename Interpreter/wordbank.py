@@ -0,0 +1,533 @@
+import hashlib
+import marshal
+import mmap
+import os
+import re
+import struct
+import threading
+from bisect import bisect_left
+from collections.abc import Sequence
+from functools import lru_cache
+import numpy as np
+from . import journal
+
+class WordBankError(Exception):
+    pass
+
+class WordBank:
+    """A parsed word bank.
+
+    Banks handed out by load_bank() are shared by every interpreter in the
+    process and hold tuples; call copy() to get a private, editable bank.
+    """
+
+    def __init__(self, mode="letters", words=None, word_data=None, categories=None, shared=False, version=None):
+        self.mode = mode
+        self.words = words if words is not None else []
+        self.word_data = word_data if word_data is not None else []
+        self.categories = categories if categories is not None else []
+        self.shared = shared
+        # bank_version() of the file a shared bank was parsed from
+        self.version = version
+        self._index = None
+        # words on more than one row, when _index was built here
+        self._dups = None
+        self._derived = {}
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return self.lookup(word) is not None
+
+    def lookup(self, word):
+        """Row number of the first entry for word, or None."""
+        if self._index is None:
+            index, dups = {}, set()
+            for i, w in enumerate(self.words):
+                if index.setdefault(w, i) != i:
+                    dups.add(w)
+            self._index, self._dups = index, dups
+        return self._index.get(word)
+
+    def derived(self, key, build):
+        """build(bank) for this bank, computed once and kept until the bank changes."""
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build(self)
+        return value
+
+    def append(self, row):
+        i = len(self.words)
+        self.word_data.append(row)
+        self.words.append(row[0])
+        if self._index is not None:
+            if self._index.setdefault(row[0], i) != i and self._dups is not None:
+                self._dups.add(row[0])
+        self._derived.clear()
+
+    def replace(self, i, row):
+        old, new = self.words[i], row[0]
+        self.word_data[i] = row
+        self.words[i] = new
+        if self._index is not None and old != new:
+            if self._dups is None or old in self._dups:
+                # another row may hold old; find it on the next lookup
+                self._index = None
+            else:
+                del self._index[old]
+                first = self._index.setdefault(new, i)
+                if first != i:
+                    self._dups.add(new)
+                    self._index[new] = min(first, i)
+        self._derived.clear()
+
+    def pop(self, i):
+        removed = self.word_data.pop(i)
+        self.words.pop(i)
+        # every later row shifts down; rebuild on the next lookup
+        self._index = None
+        self._derived.clear()
+        return removed
+
+    def copy(self):
+        bank = WordBank(
+            self.mode,
+            list(self.words),
+            [list(row) for row in self.word_data],
+            list(self.categories),
+        )
+        if self._index is not None:
+            bank._index = dict(self._index)
+            bank._dups = set(self._dups) if self._dups is not None else None
+        return bank
+
+_NAME_BREAK = re.compile(r"(?<!^)(?=[A-Z0-9])")
+
+@lru_cache(maxsize=1 << 16)
+def display_name(word):
+    """Insert spaces before capitals/numbers of PascalCase names"""
+    if re.search(r"[A-Z0-9]", word[1:]):
+        return _NAME_BREAK.sub(" ", word)
+    return word
+
+def display_names(bank):
+    """Display name of every row, in row order."""
+    return bank.derived("display_names", lambda b: tuple(display_name(w) for w in bank_words(b)))
+
+def normalized_rows(bank):
+    """Every row with its values stripped and lowercased, for comparing categories."""
+    return bank.derived("normalized_rows", lambda b: tuple(tuple(v.strip().lower() for v in row) for row in b.word_data))
+
+def category_codes(bank):
+    """Dictionary-encode a categories bank, one column at a time.
+
+    Returns (codes, values): codes is an int32 array with a row per entry
+    and a column per category, holding each cell's index into that
+    column's values (normalized strings), or -1 where the row is short.
+    """
+    def build(b):
+        rows = normalized_rows(b)
+        width = max((len(row) - 1 for row in rows), default=0)
+        columns, values = [], []
+        for i in range(1, width + 1):
+            vocab = {}
+            columns.append([vocab.setdefault(row[i], len(vocab)) if i < len(row) else -1 for row in rows])
+            values.append(list(vocab))
+        codes = np.array(columns, dtype=np.int32).T.reshape(len(rows), width)
+        return np.ascontiguousarray(codes), values
+    return bank.derived("category_codes", build)
+
+class CompletionIndex:
+    """Prefix search over a bank's words and their display names.
+
+    Keys are lowercased and kept in sorted arrays: heads holds every raw
+    word and full display name, inner every display name suffix starting
+    at a later word ("heng imbibitor lunae" for DanHengImbibitorLunae).
+    Build it through bank.derived("completion", CompletionIndex).
+    """
+
+    def __init__(self, bank):
+        self.words = bank.words
+        heads, inner = [], []
+        for row, (word, name) in enumerate(zip(bank_words(bank), display_names(bank))):
+            name = name.lower()
+            heads.append((word.lower(), row))
+            if name != heads[-1][0]:
+                heads.append((name, row))
+            parts = name.split()
+            for i in range(1, len(parts)):
+                inner.append((" ".join(parts[i:]), row))
+        heads.sort()
+        inner.sort()
+        self._heads = ([k for k, _ in heads], [r for _, r in heads])
+        self._inner = ([k for k, _ in inner], [r for _, r in inner])
+
+    def complete(self, query, k=10):
+        """Up to k (word, display name) pairs; matches at the start of a name come first."""
+        query = " ".join(query.lower().split())
+        matches, seen = [], set()
+        for keys, key_rows in (self._heads, self._inner):
+            i = bisect_left(keys, query)
+            while i < len(keys) and len(matches) < k and keys[i].startswith(query):
+                word = self.words[key_rows[i]]
+                if word not in seen:
+                    seen.add(word)
+                    matches.append(word)
+                i += 1
+        return [(word, display_name(word)) for word in matches]
+
+def parse_bank(lines):
+    """Build a shared WordBank from the lines of a word bank file."""
+    lines = [line.strip() for line in lines if line.strip()]
+    if not lines:
+        return WordBank(shared=True, words=(), word_data=(), categories=())
+    first_line = lines[0]
+    if "|" in first_line:
+        if first_line.lower().startswith("word |"):
+            mode = "categories"
+        else:
+            mode = "hints"
+    else:
+        mode = "letters"
+    words, word_data, categories = [], [], []
+    if mode == "letters":
+        words = lines
+        word_data = [(w,) for w in lines]
+    elif mode == "hints":
+        for line in lines:
+            parts = tuple(p.strip() for p in line.split("|"))
+            word_data.append(parts)
+            words.append(parts[0])
+    elif mode == "categories":
+        headers = [h.strip() for h in lines[0].split("|")]
+        if headers[0].lower() != "word":
+            raise WordBankError("missing 'word' header")
+        categories = headers[1:]
+        for line in lines[1:]:
+            parts = tuple(p.strip() for p in line.split("|"))
+            if not parts or not parts[0]:
+                continue
+            word_data.append(parts)
+            words.append(parts[0])
+    return WordBank(mode, tuple(words), tuple(word_data), tuple(categories), shared=True)
+
+def bank_lines(bank):
+    """The lines of the text file for bank, in the format parse_bank() reads."""
+    if bank.mode == "categories":
+        if bank.categories:
+            yield "word | " + " | ".join(bank.categories)
+        for row in bank.word_data:
+            yield " | ".join(row)
+    elif bank.mode == "hints":
+        for row in bank.word_data:
+            yield " | ".join(row)
+    elif bank.mode == "letters":
+        for row in bank.word_data:
+            yield row[0]
+
+def write_bank(filepath, bank):
+    """Rewrite filepath with bank, atomically, and drop its journal."""
+    tmp = filepath + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for line in bank_lines(bank):
+            f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filepath)
+    # the journal's base no longer matches, so it is already ignored;
+    # removing it just frees the space
+    journal.discard_journal(filepath)
+
+# Bank files at least this big are opened as a LazyBank
+LAZY_BYTES = 16 << 20
+
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"LEXIDX01"
+# magic, then source mtime_ns, source size, row count, mode, offset of the first line
+_INDEX_HEADER = struct.Struct("<8sqqqqq")
+_MODES = ("letters", "hints", "categories")
+
+def _word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+def _split_row(mode, line):
+    if mode == "letters":
+        return (line,)
+    return tuple(p.strip() for p in line.split("|"))
+
+def build_index(filepath):
+    """Scan filepath and write its .idx sidecar; returns the sidecar path.
+
+    The sidecar holds the byte offset of every row plus the rows sorted by
+    a 64-bit hash of their word, so LazyBank can find a word with a binary
+    search and read only that row.
+    """
+    st = os.stat(filepath)
+    blake2b = hashlib.blake2b
+    starts, digests = [], bytearray()
+    mode, first = "letters", -1
+    pos = 0
+    with open(filepath, "rb") as f:
+        for raw in f:
+            line = raw.decode("utf-8").strip()
+            start, pos = pos, pos + len(raw)
+            if not line:
+                continue
+            if first < 0:
+                first = start
+                if "|" in line:
+                    mode = "categories" if line.lower().startswith("word |") else "hints"
+                if mode == "categories":
+                    continue  # the header
+            word = line if mode == "letters" else line.split("|", 1)[0].strip()
+            if mode == "categories" and not word:
+                continue
+            starts.append(start)
+            digests += blake2b(word.encode("utf-8"), digest_size=8).digest()
+    starts = np.array(starts, dtype=np.uint64)
+    hashes = np.frombuffer(bytes(digests), dtype="<u8").astype(np.uint64)
+    # by hash, then row, so the first match is the first occurrence
+    order = np.lexsort((np.arange(len(hashes)), hashes)).astype(np.uint32)
+    path = filepath + INDEX_SUFFIX
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, st.st_mtime_ns, st.st_size, len(starts), _MODES.index(mode), first))
+        f.write(starts.tobytes())
+        f.write(hashes[order].tobytes())
+        f.write(order.tobytes())
+    os.replace(tmp, path)
+    return path
+
+class _Column(Sequence):
+    """Read-only list view of a LazyBank's rows (or just their words)."""
+
+    def __init__(self, bank, words_only):
+        self._bank = bank
+        self._words_only = words_only
+
+    def __len__(self):
+        return len(self._bank)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("row index out of range")
+        row = self._bank._row(i)
+        return row[0] if self._words_only else row
+
+class LazyBank(WordBank):
+    """A shared word bank backed by the memory-mapped file and its .idx sidecar.
+
+    Rows are decoded only when they are read, so opening a bank costs the
+    same whatever its size. It behaves like a shared WordBank; copy()
+    returns an ordinary, fully loaded WordBank for editing.
+    """
+
+    def __init__(self, filepath, version=None):
+        index_path = filepath + INDEX_SUFFIX
+        st = os.stat(filepath)
+        header = self._read_header(index_path)
+        if header is None or header[1:3] != (st.st_mtime_ns, st.st_size):
+            build_index(filepath)
+            header = self._read_header(index_path)
+        _, _, _, n, mode, first = header
+        self.mode = _MODES[mode]
+        self.shared = True
+        self.version = version
+        self._derived = {}
+        self._n = n
+        self._file = open(filepath, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = _INDEX_HEADER.size
+        if n:
+            self._starts = np.memmap(index_path, np.uint64, "r", offset, (n,))
+            self._hashes = np.memmap(index_path, np.uint64, "r", offset + 8 * n, (n,))
+            self._order = np.memmap(index_path, np.uint32, "r", offset + 16 * n, (n,))
+        else:
+            self._starts = self._hashes = np.zeros(0, np.uint64)
+            self._order = np.zeros(0, np.uint32)
+        self.categories = ()
+        if self.mode == "categories":
+            self.categories = tuple(h.strip() for h in self._line(first).split("|"))[1:]
+        self.words = _Column(self, True)
+        self.word_data = _Column(self, False)
+        self._row = lru_cache(maxsize=4096)(self._read_row)
+
+    @staticmethod
+    def _read_header(index_path):
+        try:
+            with open(index_path, "rb") as f:
+                header = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+        except (OSError, struct.error):
+            return None
+        return header if header[0] == _INDEX_MAGIC else None
+
+    def _line(self, start):
+        end = self._data.find(b"\n", start)
+        if end < 0:
+            end = len(self._data)
+        return self._data[start:end].decode("utf-8").strip()
+
+    def _read_row(self, i):
+        return _split_row(self.mode, self._line(int(self._starts[i])))
+
+    def __len__(self):
+        return self._n
+
+    def lookup(self, word):
+        h = np.uint64(_word_hash(word))
+        lo = int(np.searchsorted(self._hashes, h, "left"))
+        hi = int(np.searchsorted(self._hashes, h, "right"))
+        for k in range(lo, hi):
+            i = int(self._order[k])
+            if self._row(i)[0] == word:
+                return i
+        return None
+
+    def scan_words(self):
+        """Every row's word, in row order, read in one pass over the mapped file."""
+        lines = (line.strip() for line in self._data[:].decode("utf-8").split("\n"))
+        lines = [line for line in lines if line]
+        if self.mode == "letters":
+            return lines
+        if self.mode == "categories":
+            lines = lines[1:]  # the header
+        words = [line.split("|", 1)[0].strip() for line in lines]
+        if self.mode == "categories":
+            words = [word for word in words if word]
+        return words
+
+    def copy(self):
+        return WordBank(
+            self.mode,
+            list(self.words),
+            [list(row) for row in self.word_data],
+            list(self.categories),
+        )
+
+def bank_words(bank):
+    """The bank's words in row order, without decoding a LazyBank row by row."""
+    if isinstance(bank, LazyBank):
+        return bank.scan_words()
+    return bank.words
+
+COMPILED_SUFFIX = ".lxb"
+_COMPILED_MAGIC = b"LXB1"
+
+def compile_bank(filepath):
+    """Write filepath's compiled artifact (<file>.lxb) and return its path.
+
+    The artifact is a marshal dump of the parsed rows, the word -> row
+    map, display names and (for categories banks) normalized rows. Equal
+    strings are stored once.
+    It records the text file's mtime and size and is ignored once they
+    change, so the text file stays the source of truth.
+    """
+    st = os.stat(filepath)
+    with open(filepath, "r", encoding="utf-8") as f:
+        bank = parse_bank(f)
+    strings = {}
+    intern = lambda s: strings.setdefault(s, s)
+    rows = tuple(tuple(intern(v) for v in row) for row in bank.word_data)
+    payload = {
+        "source": (st.st_mtime_ns, st.st_size),
+        "mode": bank.mode,
+        "categories": tuple(intern(c) for c in bank.categories),
+        "rows": rows,
+        "index": {intern(w): i for i, w in reversed(list(enumerate(bank.words)))},
+        "display_names": tuple(intern(display_name(row[0])) for row in rows),
+    }
+    if bank.mode == "categories":
+        payload["normalized_rows"] = tuple(tuple(intern(v.strip().lower()) for v in row) for row in rows)
+    path = filepath + COMPILED_SUFFIX
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_COMPILED_MAGIC + marshal.dumps(payload))
+    os.replace(tmp, path)
+    return path
+
+def _load_compiled(filepath):
+    """The bank from filepath's artifact, or None if it is missing or stale."""
+    try:
+        with open(filepath + COMPILED_SUFFIX, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if not data.startswith(_COMPILED_MAGIC):
+        return None
+    try:
+        payload = marshal.loads(data[len(_COMPILED_MAGIC):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    st = os.stat(filepath)
+    if tuple(payload["source"]) != (st.st_mtime_ns, st.st_size):
+        return None
+    rows = payload["rows"]
+    bank = WordBank(payload["mode"], tuple(row[0] for row in rows), rows, payload["categories"], shared=True)
+    bank._index = payload["index"]
+    bank._derived["display_names"] = payload["display_names"]
+    if "normalized_rows" in payload:
+        bank._derived["normalized_rows"] = payload["normalized_rows"]
+    return bank
+
+# Parsed banks keyed by absolute path; an entry is reused while the file
+# and its journal are unchanged.
+_cache = {}
+_cache_lock = threading.Lock()
+
+def bank_version(filepath):
+    """(mtime_ns, size) of the bank file followed by those of its journal (0, 0 if none)."""
+    st = os.stat(filepath)
+    try:
+        jst = os.stat(journal.journal_path(filepath))
+        jstamp = (jst.st_mtime_ns, jst.st_size)
+    except FileNotFoundError:
+        jstamp = (0, 0)
+    return (st.st_mtime_ns, st.st_size) + jstamp
+
+def _parse_file(filepath):
+    ops = journal.read_ops(filepath)
+    compiled = None if ops else _load_compiled(filepath)
+    if compiled is not None:
+        return compiled
+    if not ops and os.path.getsize(filepath) >= LAZY_BYTES:
+        try:
+            return LazyBank(filepath)
+        except OSError:
+            pass  # no writable sidecar; parse it the usual way
+    with open(filepath, "r", encoding="utf-8") as f:
+        bank = parse_bank(f)
+    if ops:
+        bank = bank.copy()
+        for op in ops:
+            journal.apply_op(bank, op)
+        # go through the text format so the result is exactly what a full
+        # rewrite of the file would load as
+        bank = parse_bank(bank_lines(bank))
+    return bank
+
+def load_bank(filepath):
+    """Return the shared WordBank for filepath, parsing it only when it changed."""
+    key = os.path.abspath(filepath)
+    stamp = bank_version(filepath)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    bank = _parse_file(filepath)
+    bank.version = stamp
+    with _cache_lock:
+        _cache[key] = (stamp, bank)
+    return bank
+
+def invalidate_bank(filepath):
+    with _cache_lock:
+        _cache.pop(os.path.abspath(filepath), None)
+
+def clear_bank_cache():
+    with _cache_lock:
+        _cache.clear()
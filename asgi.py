@@ -0,0 +1,232 @@
+"""Asyncio entry point for the game API.
+
+    uvicorn asgi:app        (or any other ASGI server)
+
+Serves the same /run/<game>, /run/<game>/batch, /fetch/session/<game>,
+/resume/<game>, /complete/<game> and /reset_game/<game> contract as
+app.py and shares its session store, signed
+session cookie and interpreter pool. A request only holds a coroutine while
+its body arrives and its response is sent, so idle or slow connections cost
+no thread. Commands, bank files and the session store are blocking, so that
+work runs in a bounded thread pool (LEXIS_ASGI_THREADS, default 8).
+"""
+import asyncio
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+from werkzeug.http import dump_cookie, parse_cookie
+import game_api
+from app import app as flask_app
+from game_api import ChunkedJSON
+
+executor = ThreadPoolExecutor(max_workers=int(os.environ.get("LEXIS_ASGI_THREADS", "8")), thread_name_prefix="lexis")
+
+# request bodies are single commands or short batches
+MAX_BODY = 1 << 20
+
+
+def json_body(body, query):
+    try:
+        return (json.loads(body),)
+    except ValueError:
+        return (None,)
+
+
+def completion_query(body, query):
+    # same defaults and bounds as app.complete
+    args = parse_qs(query)
+    try:
+        k = int(args.get("k", ["10"])[0])
+    except ValueError:
+        k = 10
+    return args.get("q", [""])[0], min(max(k, 1), 100)
+
+
+# (method, path, handler, builds the handler's extra arguments from the body and query string)
+routes = [
+    ("POST", re.compile(r"/run/([^/]+)/batch"), game_api.run_batch, json_body),
+    ("POST", re.compile(r"/run/([^/]+)"), game_api.run_command, json_body),
+    ("POST", re.compile(r"/fetch/session/([^/]+)"), game_api.fetch_session, None),
+    ("POST", re.compile(r"/resume/([^/]+)"), game_api.resume, None),
+    ("GET", re.compile(r"/complete/([^/]+)"), game_api.complete, completion_query),
+    ("POST", re.compile(r"/reset_game/([^/]+)"), game_api.reset_game, None),
+]
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+    elif scope["type"] == "http":
+        await handle_http(scope, receive, send)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def handle_http(scope, receive, send):
+    for method, pattern, handler, parse in routes:
+        match = pattern.fullmatch(scope["path"])
+        if match:
+            break
+    else:
+        await send_json(send, 404, {"status": "error", "message": "Not found"})
+        return
+    if scope["method"] != method:
+        await send_json(send, 405, {"status": "error", "message": "Method not allowed"})
+        return
+
+    body = await read_body(receive)
+    if body is None:
+        return  # the client went away
+    if len(body) > MAX_BODY:
+        await send_json(send, 413, {"status": "error", "message": "Request body too large"})
+        return
+    headers = dict((k.decode("latin-1"), v.decode("latin-1")) for k, v in scope["headers"])
+    cookie = parse_cookie(headers.get("cookie", "")).get(flask_app.session_interface.get_cookie_name(flask_app))
+
+    loop = asyncio.get_running_loop()
+    query = scope.get("query_string", b"").decode("latin-1")
+    payload, status, set_cookie = await loop.run_in_executor(
+        executor, call, handler, match.group(1), parse, body, query, cookie
+    )
+    extra = [(b"set-cookie", set_cookie.encode("latin-1"))] if set_cookie else []
+    if not isinstance(payload, ChunkedJSON):
+        await send_json(send, status, payload, extra)
+        return
+
+    # build each chunk off the event loop too; large listings take a while
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json")] + extra})
+    chunks = payload.chunks()
+    while True:
+        chunk = await loop.run_in_executor(executor, next, chunks, None)
+        if chunk is None:
+            break
+        await send({"type": "http.response.body", "body": chunk.encode("utf-8"), "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def read_body(receive):
+    """The request body (cut short once it passes MAX_BODY), or None on disconnect."""
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY or not message.get("more_body"):
+            return bytes(body)
+
+
+def call(handler, game, parse, body, query, cookie):
+    """Run a game_api endpoint with the cookie's session; runs in the executor.
+
+    Returns (payload, status, Set-Cookie header or None).
+    """
+    iface = flask_app.session_interface
+    session = iface.session_for_cookie(flask_app.secret_key, cookie)
+    args = parse(body, query) if parse else ()
+    payload, status = handler(session, game, *args)
+
+    name = iface.get_cookie_name(flask_app)
+    domain = iface.get_cookie_domain(flask_app)
+    path = iface.get_cookie_path(flask_app)
+    value = iface.persist(flask_app.secret_key, session, flask_app.permanent_session_lifetime.total_seconds())
+    if value == "":
+        set_cookie = dump_cookie(name, "", expires=0, max_age=0, domain=domain, path=path)
+    elif value is not None:
+        set_cookie = dump_cookie(
+            name,
+            value,
+            expires=iface.get_expiration_time(flask_app, session),
+            httponly=iface.get_cookie_httponly(flask_app),
+            domain=domain,
+            path=path,
+            secure=iface.get_cookie_secure(flask_app),
+            samesite=iface.get_cookie_samesite(flask_app),
+        )
+    else:
+        set_cookie = None
+    return payload, status, set_cookie
+
+
+async def send_json(send, status, payload, headers=()):
+    body = flask_app.json.dumps(payload).encode("utf-8")
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode())] + list(headers)})
+    await send({"type": "http.response.body", "body": body})
+
+
+class ClientResponse:
+    def __init__(self, status, headers, body):
+        self.status_code = status
+        self.headers = headers
+        self.data = body
+
+    def get_json(self):
+        return json.loads(self.data)
+
+
+class Client:
+    """In-process client that calls the ASGI app directly, keeping the session cookie.
+
+        client = Client()
+        response = await client.post("/run/snuzzle", json={"command": "start"})
+        response = await client.get("/complete/raildle?q=dan")
+    """
+
+    def __init__(self, asgi_app=app):
+        self.app = asgi_app
+        self.cookie = None
+
+    async def post(self, path, json=None, data=b""):
+        return await self.request("POST", path, json, data)
+
+    async def get(self, path):
+        return await self.request("GET", path)
+
+    async def request(self, method, path, json=None, data=b""):
+        if json is not None:
+            data = flask_app.json.dumps(json).encode("utf-8")
+        path, _, query = path.partition("?")
+        headers = [(b"content-type", b"application/json")]
+        if self.cookie:
+            headers.append((b"cookie", self.cookie.encode("latin-1")))
+        scope = {"type": "http", "method": method, "path": path, "headers": headers,
+                 "query_string": query.encode("latin-1"), "http_version": "1.1", "scheme": "http"}
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": data, "more_body": False}
+
+        status, response_headers, body = None, [], bytearray()
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in message["headers"]]
+            else:
+                body.extend(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        for key, value in response_headers:
+            if key == "set-cookie":
+                cookie = value.split(";", 1)[0]
+                self.cookie = None if cookie.endswith("=") else cookie
+        return ClientResponse(status, response_headers, bytes(body))
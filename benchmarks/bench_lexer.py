@@ -0,0 +1,74 @@
+"""Tokenizer micro-benchmark: current Lexer against the previous per-token re.compile lexer.
+
+Run from the repository root:  python benchmarks/bench_lexer.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter.lexer import Lexer, Token, TokenType
+
+class LegacyLexer:
+    """The lexer as it was before the master-regex rewrite, kept for comparison."""
+
+    def __init__(self, src: str):
+        self.src = src
+        self.pos = 0
+        self.regex_patterns = [
+            (r'\s+', None),
+            (r'\|', TokenType.PIPE),
+            (r'\d+', TokenType.INT),
+            (r'"([^"\\]|\\.)*"', TokenType.STRING),
+            (r'[A-Za-z_][A-Za-z0-9_./\\-]*', TokenType.IDENT),
+        ]
+
+    def next_token(self):
+        if self.pos >= len(self.src):
+            return Token(TokenType.EOF, "")
+        for pattern, ttype in self.regex_patterns:
+            regex = re.compile(pattern)
+            m = regex.match(self.src, self.pos)
+            if m:
+                text = m.group(0)
+                self.pos = m.end()
+                if not ttype:
+                    return self.next_token()
+                if ttype == TokenType.STRING:
+                    text = text[1:-1]
+                    text = text.replace('\\"', '"').replace('\\\\', '\\')
+                return Token(ttype, text)
+        raise ValueError(f"Unexpected character at: {self.src[self.pos:]}")
+
+    def tokens(self):
+        toks = []
+        while True:
+            tok = self.next_token()
+            toks.append(tok)
+            if tok.type == TokenType.EOF:
+                break
+        return toks
+
+COMMANDS = [
+    "start",
+    "show",
+    "words",
+    "file raildle.txt",
+    "max_guesses 6",
+    "guess Acheron",
+    'add Kafka | Nihility | Lightning | "Stellaron Hunters" | "Regret of Infinite Ochema"',
+]
+
+def main(number=20_000):
+    print(f"{'command':<40} {'legacy (us)':>12} {'current (us)':>13} {'speedup':>8}")
+    for cmd in COMMANDS:
+        assert list(Lexer(cmd).tokens()) == LegacyLexer(cmd).tokens()
+        old = timeit.timeit(lambda: LegacyLexer(cmd).tokens(), number=number) / number
+        new = timeit.timeit(lambda: list(Lexer(cmd).tokens()), number=number) / number
+        label = cmd if len(cmd) <= 40 else cmd[:37] + "..."
+        print(f"{label:<40} {old * 1e6:>12.2f} {new * 1e6:>13.2f} {old / new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
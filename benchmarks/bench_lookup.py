@@ -0,0 +1,48 @@
+"""Guess-path timing on large letters banks.
+
+Run from the repository root:  python benchmarks/bench_lookup.py
+"""
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter import Interpreter
+
+SIZES = [1_000, 10_000, 100_000, 250_000]
+ROUNDS = 2_000
+
+def synthetic_words(n):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(p) for p in itertools.islice(itertools.product(letters, repeat=5), n)]
+
+def time_guesses(interp, words):
+    # guesses spread over the whole bank, including the last rows
+    picks = [words[(i * 7919) % len(words)] for i in range(ROUNDS)]
+    picks[-1] = words[-1]
+    start = time.perf_counter()
+    for word in picks:
+        interp.remaining_guesses = interp.max_guesses
+        interp.secret = words[0]
+        interp.run_once(f"guess {word}")
+    return (time.perf_counter() - start) / ROUNDS
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.makedirs("WordBanks")
+        print(f"{'words':>10} {'per guess (us)':>16}")
+        for n in SIZES:
+            words = synthetic_words(n)
+            with open(os.path.join("WordBanks", f"bench_{n}.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(words) + "\n")
+            interp = Interpreter()
+            interp.run_once(f"file bench_{n}.txt")
+            interp.run_once(f"word {words[0]}")
+            print(f"{n:>10} {time_guesses(interp, words) * 1e6:>16.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Letters-mode scoring throughput: vectorized engine against the per-guess Python loop.
+
+Run from the repository root:  python benchmarks/bench_scoring.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter import scoring
+
+def scalar_feedback(guess, secret):
+    """The dict-counting loop _make_feedback used before the engine existed."""
+    feedback = ["⬜"] * len(guess)
+    secret_counts = {}
+    for ch in secret:
+        secret_counts[ch] = secret_counts.get(ch, 0) + 1
+    for i, ch in enumerate(guess):
+        if i < len(secret) and ch == secret[i]:
+            feedback[i] = "🟩"
+            secret_counts[ch] -= 1
+    for i, ch in enumerate(guess):
+        if feedback[i] == "⬜" and ch in secret_counts and secret_counts[ch] > 0:
+            feedback[i] = "🟨"
+            secret_counts[ch] -= 1
+    return "".join(feedback)
+
+def random_words(n, seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(5)) for _ in range(n)]
+
+def rate(n, seconds):
+    return f"{n / seconds:>14,.0f}"
+
+def main():
+    print(f"{'guesses':>9} {'scalar (g/s)':>14} {'many (g/s)':>14} {'against (g/s)':>14}")
+    for n in (1_000, 10_000, 100_000, 1_000_000):
+        words = random_words(n)
+        secret = words[0]
+        encoded = scoring.encode(words)
+        encoded_secret = scoring.encode([secret])[0]
+
+        sample = words[:min(n, 100_000)]
+        start = time.perf_counter()
+        for w in sample:
+            scalar_feedback(w, secret)
+        scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scoring.score(encoded, encoded_secret)
+        many = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scoring.score(encoded_secret, encoded)
+        against = time.perf_counter() - start
+
+        print(f"{n:>9} {rate(len(sample), scalar)} {rate(n, many)} {rate(n, against)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Solve time of the 'suggest' command against bank size.
+
+Run from the repository root:  python benchmarks/bench_suggest.py [workers]
+
+'opening' ranks every word against the whole bank (computed once per
+bank, then cached); 'turn 2' and 'turn 3' rank after one and two guesses.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter import scoring, solver
+from Interpreter.wordbank import WordBank
+
+def random_words(n, seed=0):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(5)))
+    return sorted(words)
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else solver.default_workers()
+    print(f"workers: {workers or 'in-process'}")
+    print(f"{'words':>7} {'opening (s)':>12} {'turn 2 (s)':>11} {'turn 3 (s)':>11} {'left':>6}")
+    for n in (500, 1_000, 2_000, 5_000, 10_000):
+        bank = WordBank(words=random_words(n))
+        secret = bank.words[n // 2]
+        history = []
+        (picks, _), opening = timed(lambda: solver.suggest(bank, history, 5, workers))
+        history.append((picks[0][0], list(scoring.score_one(picks[0][0], secret))))
+        (picks, _), turn2 = timed(lambda: solver.suggest(bank, history, 5, workers))
+        history.append((picks[0][0], list(scoring.score_one(picks[0][0], secret))))
+        (_, left), turn3 = timed(lambda: solver.suggest(bank, history, 5, workers))
+        print(f"{n:>7} {opening:>12.3f} {turn2:>11.3f} {turn3:>11.3f} {left:>6}")
+
+if __name__ == "__main__":
+    main()
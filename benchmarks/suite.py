@@ -0,0 +1,380 @@
+"""Benchmark suite for the interpreter and the game endpoints.
+
+Run from the repository root:
+
+    python benchmarks/suite.py                      # compare with benchmarks/baseline.json
+    python benchmarks/suite.py --sizes 1000,10000   # smaller banks only
+    python benchmarks/suite.py --filter endpoint    # cases whose name matches a regex
+    python benchmarks/suite.py --json out.json      # also write the results
+    python benchmarks/suite.py --save-baseline      # make these results the new baseline
+
+Synthetic letters, hints and categories banks are generated in a temporary
+WordBanks folder. Every case reports the best seconds per operation over up
+to 15 timed rounds. Cases found in the baseline are compared with it; the
+script exits with status 1 if any of them got slower than the threshold
+allows (default 25%, more for the noisier cases in THRESHOLD_SCALE) and
+by more than the noise floor (default 10 us), so microsecond cases do not
+fail on timer jitter. Bank load/save cases are dominated by file system
+latency and fsync, so they are reported but never fail the run. Timings only compare on the same machine, so keep the
+baseline from the machine the suite runs on.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from Interpreter import Interpreter
+from Interpreter.journal import discard_journal
+from Interpreter.lexer import Lexer, TokenType
+from Interpreter.parser import Parser
+from Interpreter.wordbank import clear_bank_cache
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+MODES = ["letters", "hints", "categories"]
+
+# game whose response formatting each mode goes through on the endpoints
+GAMES = {"letters": "snuzzle", "hints": "filmster", "categories": "raildle"}
+
+# run_once cases: label -> command, formatted with two words from the bank
+RUN_ONCE = {
+    "word": "word {secret}",
+    "guess": "guess {other}",
+    "show": "show",
+    "words": "words 0 100",
+    "candidates": "candidates 10",
+    "help": "help",
+    "suggest": "suggest 5",
+}
+
+# 'suggest' ranks every word against the candidates, so it stays on small banks
+SUGGEST_MAX = 10_000
+
+# case name prefix -> multiple of --threshold for cases that vary more between
+# runs: the whole request stack by up to ~50%, 'suggest' (NumPy over the
+# whole bank) by up to ~35%
+THRESHOLD_SCALE = {"endpoint/": 3, "run_once/suggest/": 2}
+
+# case name prefixes that are compared but never fail the run: their time is
+# mostly file system latency, which swings by 2x between runs
+REPORT_ONLY = ("load_file/", "save_file/")
+
+COMMANDS = {
+    "play": [
+        "file snuzzle.txt",
+        "start",
+        "word apple",
+        "guess crane",
+        "words 100 50 ap",
+        "max_guesses 6",
+        "suggest 5",
+    ],
+    "edit": [
+        "file raildle.txt",
+        "add Acheron | Nihility | Lightning | Self-Annihilators | Past Evils",
+        "edit 12 | Aglaea | Remembrance | Lightning | Amphoreus",
+        'categories Path | Element | "World/Faction" | "Weekly Boss"',
+        "delete 3",
+    ],
+}
+
+
+class Results(dict):
+    """Case name -> seconds per operation, for the cases --filter selects."""
+
+    def __init__(self, pattern=""):
+        super().__init__()
+        self.pattern = re.compile(pattern)
+
+    def case(self, name, fn, setup=None, per=1, **options):
+        if self.pattern.search(name):
+            self[name] = measure(fn, setup, **options) / per
+
+
+def measure(fn, setup=None, repeat=15, min_time=0.05, max_loops=1 << 16, max_time=5.0):
+    """Best seconds per call of fn over up to repeat rounds.
+
+    setup runs untimed before each round. One untimed call first fills the
+    per-bank caches (sorted words, category codes, ...). The first round
+    doubles its loop count until it takes min_time (or reaches max_loops);
+    rounds stop early once max_time has been spent.
+    """
+    def round_time(loops):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - start
+
+    round_time(1)
+    loops = 1
+    spent = best = round_time(loops)
+    while best < min_time and loops < max_loops:
+        loops = min(loops * 2, max_loops)
+        best = round_time(loops)
+        spent += best
+    best /= loops
+    for _ in range(repeat - 1):
+        if spent > max_time:
+            break
+        t = round_time(loops)
+        spent += t
+        best = min(best, t / loops)
+    return best
+
+
+# Synthetic banks
+
+def letter_words(n, seed=0):
+    rng = np.random.default_rng(seed)
+    words = np.unique(rng.integers(ord("a"), ord("z") + 1, (int(n * 1.1) + 100, 5), dtype=np.uint8).view("S5"))
+    rng.shuffle(words)
+    return sorted(w.decode() for w in words[:n])
+
+
+def bank_lines(mode, n):
+    if mode == "letters":
+        return letter_words(n)
+    if mode == "hints":
+        return [f"Movie{i:07d} | First hint {i % 97} | Second hint {i % 89} | Third hint {i % 83}" for i in range(n)]
+    lines = ["word | Path | Element | World | Boss"]
+    lines += [f"Char{i:07d} | Path{i % 7} | Element{i % 7 * 3 % 7} | World{i % 31} | Boss{i % 101}" for i in range(n)]
+    return lines
+
+
+def write_bank(mode, n):
+    """Write WordBanks/bench_<mode>_<n>.txt; returns (file name, two words in it)."""
+    lines = bank_lines(mode, n)
+    name = f"bench_{mode}_{n}.txt"
+    with open(os.path.join("WordBanks", name), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    rows = lines[1:] if mode == "categories" else lines
+    words = [row.split("|")[0].strip() for row in (rows[len(rows) // 3], rows[-1])]
+    return name, words
+
+
+# Cases
+
+def bench_lexer(results):
+    sources = COMMANDS["play"] + COMMANDS["edit"]
+    tokens = sum(len(list(Lexer(src).tokens())) - 1 for src in sources)  # not counting EOF
+
+    def lex_all():
+        for src in sources:
+            lexer = Lexer(src)
+            while lexer.next_token().type != TokenType.EOF:
+                pass
+
+    results.case("lexer/next_token", lex_all, per=tokens)
+
+
+def bench_parser(results):
+    for mode, sources in COMMANDS.items():
+        token_lists = [list(Lexer(src).tokens()) for src in sources]
+
+        def parse_all():
+            for tokens in token_lists:
+                Parser(tokens, mode).parse()
+
+        results.case(f"parser/parse/{mode}", parse_all, per=len(token_lists))
+
+
+def bench_interpreter(results, mode, n, name, words):
+    secret, other = words
+    interp = Interpreter()
+    interp.run_once(f"file {name}")
+    interp.run_once("start")
+
+    def new_game():
+        interp.run_once(f"word {secret}")
+        interp.max_guesses = interp.remaining_guesses = 1 << 30
+
+    for label, command in RUN_ONCE.items():
+        if label == "suggest" and (mode != "letters" or n > SUGGEST_MAX):
+            continue
+        command = command.format(secret=secret, other=other)
+        setup = new_game
+        if label == "suggest":
+            # rank after one guess; the opening ranking is cached per bank
+            def setup():
+                new_game()
+                interp.run_once(f"guess {other}")
+        results.case(f"run_once/{label}/{mode}/{n}", lambda: interp.run_once(command), setup)
+
+    results.case(f"make_feedback/{mode}/{n}", lambda: interp._make_feedback(other), new_game)
+
+
+def bench_files(results, mode, n, name, words):
+    interp = Interpreter()
+
+    def load():
+        clear_bank_cache()
+        interp._load_file(name)
+
+    results.case(f"load_file/{mode}/{n}", load)
+
+    path = os.path.join("WordBanks", name)
+    interp.run_once("edit")
+    row = "zzzzz" if mode == "letters" else "Extra | a | b | c | d"
+
+    def fresh_edit():
+        # drop earlier appends, then take the copy-on-write copy outside the timing
+        discard_journal(path)
+        clear_bank_cache()
+        interp.run_once(f"file {name}")
+        interp._writable_bank()
+
+    # one 'add' appended to the journal; stay below the compaction limit
+    results.case(f"save_file/journal/{mode}/{n}", lambda: interp.run_once(f"add {row}"), fresh_edit, max_loops=512)
+    # a full atomic rewrite of the bank file
+    results.case(f"save_file/rewrite/{mode}/{n}", interp._save_file, fresh_edit)
+    discard_journal(path)
+    clear_bank_cache()
+
+
+def bench_endpoints(results, mode, n, name, words):
+    from app import app
+
+    game = GAMES[mode]
+    secret, other = words
+    start = ["file " + name, "start", "max_guesses 1000000", f"word {secret}"]
+    client = None
+
+    def new_client():
+        nonlocal client
+        client = app.test_client()
+        client.post(f"/run/{game}/batch", json={"commands": start})
+
+    def run():
+        response = client.post(f"/run/{game}", json={"command": f"guess {other}"})
+        assert response.status_code == 200
+
+    def batch():
+        response = client.post(f"/run/{game}/batch", json={"commands": start + [f"guess {other}"]})
+        assert response.status_code == 200
+
+    # the session's command list grows with every /run, so keep rounds short
+    results.case(f"endpoint/run/{mode}/{n}", run, new_client, max_loops=256)
+    results.case(f"endpoint/batch/{mode}/{n}", batch, new_client, max_loops=256)
+
+
+def bank_cases(mode, n):
+    """Names of the cases run on each bank, so banks --filter leaves out are never generated."""
+    labels = [f"run_once/{label}" for label in RUN_ONCE]
+    labels += ["make_feedback", "load_file", "save_file/journal", "save_file/rewrite", "endpoint/run", "endpoint/batch"]
+    return [f"{label}/{mode}/{n}" for label in labels]
+
+
+# Reporting
+
+def compare(results, baseline, threshold, floor):
+    """Print every result next to its baseline; returns the names that regressed.
+
+    A case regresses when it is slower by more than its threshold (a ratio,
+    scaled by THRESHOLD_SCALE) and by more than floor seconds. REPORT_ONLY
+    cases are flagged the same way but never regress.
+    """
+    regressed = []
+    print(f"{'case':<42} {'time':>12} {'baseline':>12} {'ratio':>7}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<42} {format_time(value):>12} {'-':>12} {'':>7}")
+            continue
+        ratio = value / base
+        allowed = threshold * next((scale for prefix, scale in THRESHOLD_SCALE.items() if name.startswith(prefix)), 1)
+        flag = ""
+        if ratio > 1 + allowed and value - base > floor:
+            if name.startswith(REPORT_ONLY):
+                flag = "  slower (report only)"
+            else:
+                flag = "  SLOWER"
+                regressed.append(name)
+        elif ratio < 1 - allowed and base - value > floor:
+            flag = "  faster"
+        print(f"{name:<42} {format_time(value):>12} {format_time(base):>12} {ratio:>7.2f}{flag}")
+    return regressed
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated bank sizes")
+    parser.add_argument("--filter", default="", help="only run cases whose name matches this regex")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a case fails (0.25 = 25%%)")
+    parser.add_argument("--floor", type=float, default=10.0, help="ignore changes smaller than this many microseconds")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = Results(args.filter)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.makedirs("WordBanks")
+        try:
+            bench_lexer(results)
+            bench_parser(results)
+            for n in sizes:
+                for mode in MODES:
+                    if not any(map(results.pattern.search, bank_cases(mode, n))):
+                        continue
+                    name, words = write_bank(mode, n)
+                    bench_interpreter(results, mode, n, name, words)
+                    bench_files(results, mode, n, name, words)
+                    bench_endpoints(results, mode, n, name, words)
+                    clear_bank_cache()
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to '{args.baseline}'")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressed = compare(results, baseline, args.threshold, args.floor * 1e-6)
+    if regressed:
+        print(f"\n{len(regressed)} case(s) slower than baseline by more than {args.threshold:.0%} "
+              f"and {args.floor:g} us: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
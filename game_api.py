@@ -0,0 +1,427 @@
+"""Game API logic shared by the Flask app (app.py) and the asyncio entry point (asgi.py).
+
+Every function takes the request's session, a dict-like object with a
+`modified` flag (ServerSideSession), and returns plain data; the callers
+turn it into a response. Endpoint functions return (payload, status).
+"""
+import json
+import random
+from contextlib import contextmanager
+from itertools import islice
+from uuid import uuid4
+from Interpreter import InterpreterError, InterpreterPool, GuessResult, ShowResult, WordsResult
+from Interpreter.scoring import CORRECT
+from Interpreter.wordbank import CompletionIndex, display_name
+
+# One interpreter per (session, game); idle games are dropped after 30 minutes
+pool = InterpreterPool(max_size=1024, ttl=30 * 60)
+
+# 'words' listings longer than this are streamed by /run in chunks
+STREAM_WORDS = 5000
+
+games = [
+    "snuzzle", "filmster", "raildle"
+]
+
+
+class ChunkedJSON:
+    """A payload large enough to be sent as chunked JSON instead of in one piece"""
+
+    def __init__(self, value, chunk=1000):
+        self.value = value
+        self.chunk = chunk
+
+    def chunks(self):
+        """Yield the JSON text of value in pieces"""
+        value = self.value
+        if isinstance(value, dict):
+            # same key order as jsonify
+            parts = (f"{json.dumps(k)}: {json.dumps(v)}" for k, v in sorted(value.items()))
+            start, end, sep = "{", "}", ", "
+        elif isinstance(value, list):
+            parts = (json.dumps(v) for v in value)
+            start, end, sep = "[", "]", ", "
+        else:
+            text = str(value)
+            parts = (json.dumps(text[i:i + 65536])[1:-1] for i in range(0, len(text), 65536))
+            start, end, sep = '"', '"', ""
+        yield start
+        first = True
+        while True:
+            batch = list(islice(parts, self.chunk))
+            if not batch:
+                break
+            yield ("" if first else sep) + sep.join(batch)
+            first = False
+        yield end
+
+
+def session_id(session):
+    """Per-browser id used to key the interpreter pool"""
+    if not session.get("sid"):
+        session["sid"] = uuid4().hex
+    return session["sid"]
+
+
+@contextmanager
+def game_interpreter(session, game, save=True, replay=False):
+    """Check out this session's interpreter and save its game snapshot afterwards.
+
+    The snapshot kept in the session is the game's source of truth: if the
+    pool dropped the interpreter, or its revision token differs from the
+    snapshot's (another worker saved since, or the game was reset and
+    started again), the game is restored from it. If that fails the
+    InterpreterError is raised and the snapshot is left as it is, unless
+    replay is set: a batch replaying the game's commands starts over from
+    an empty interpreter instead. Read-only callers pass save=False.
+    """
+    with pool.checkout(session_id(session), game) as interp:
+        state = session.get(f"{game}_state")
+        if state is None:
+            if interp.revision is not None:
+                # the game was reset, maybe through another worker
+                interp.restore({})
+        elif interp.current_file is None or interp.revision != state.get("revision"):
+            try:
+                interp.restore(state)
+            except InterpreterError:
+                interp.restore({})
+                if not replay:
+                    raise
+        yield interp
+        if save:
+            interp.revision = uuid4().hex
+            session[f"{game}_state"] = interp.snapshot()
+
+
+def fetch_session(session, game):
+    """Fetch stored session commands formatted for batch execution"""
+    try:
+        commands = session.get(f"{game}_commands", [])
+
+        # Return in the same format that sendBatchCommands expects
+        return {"commands": commands}, 200
+
+    except Exception as e:
+        return {"status": "error", "message": f"Error fetching session: {str(e)}"}, 500
+
+
+def run_command(session, game, data):
+    """Run a single command; data is the decoded JSON body"""
+    if game not in games:
+        return {"status": "error", "message": "Invalid game"}, 404
+    if not isinstance(data, dict):
+        return {"status": "error", "message": "Invalid JSON body"}, 400
+    try:
+        command = data.get("command", "").strip()
+        if not command:
+            return {"status": "error", "message": "No command provided"}, 400
+
+        # Save the commands in current game session
+        if not session.get(f"{game}_commands"):
+            session[f"{game}_commands"] = []
+
+        # Set game loaded as false
+        if session.get(f'{game}_loaded'):
+            session[f"{game}_loaded"] = False
+
+        # Get a fresh copy of the commands list
+        commands_list = session.get(f"{game}_commands", [])
+        commands_list.append(command)
+        session[f"{game}_commands"] = commands_list
+        session.modified = True  # Force the session to be saved
+
+        with game_interpreter(session, game) as interp:
+            result = interp.run_once(command, structured=True)
+        if isinstance(result, WordsResult) and len(result.words) > STREAM_WORDS:
+            return ChunkedJSON(handle_result(session, game, command, result)), 200
+        return handle_result(session, game, command, result), 200
+
+    except InterpreterError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except Exception as e:
+        return {"status": "error", "message": f"Runtime error: {e}"}, 500
+
+
+def run_batch(session, game, data):
+    """Execute multiple commands in sequence; data is the decoded JSON body"""
+    if game not in games:
+        return {"status": "error", "message": "Invalid game"}, 404
+    if not isinstance(data, dict):
+        return {"status": "error", "message": "Invalid JSON body"}, 400
+    try:
+        commands = data.get("commands", [])
+
+        if not commands:
+            return {"status": "error", "message": "No commands provided"}, 400
+
+        # Store the whole command list for this game session at once
+        commands = [command.strip() for command in commands if command.strip()]
+        session[f"{game}_commands"] = commands
+        results = []
+
+        # Set game loaded as false
+        if session.get(f'{game}_loaded'):
+            session[f"{game}_loaded"] = False
+
+        # Reset tries count
+        session[f"{game}_triesCount"] = 0
+
+        # Run every command in one pass, then format each result
+        with game_interpreter(session, game, replay=True) as interp:
+            batch = interp.run_many(commands, structured=True)
+
+        for item in batch:
+            if item.ok:
+                try:
+                    result_data = handle_result(session, game, item.command, item.value)
+                except Exception as cmd_error:
+                    result_data = {"status": "error", "message": str(cmd_error)}
+            else:
+                result_data = {"status": "error", "message": str(item.error)}
+
+            results.append({
+                "command": item.command,
+                "result": result_data
+            })
+
+        session.modified = True
+
+        return {"status": "success", "results": results}, 200
+
+    except InterpreterError as e:
+        return {"status": "error", "message": str(e)}, 400
+    except Exception as e:
+        return {"status": "error", "message": f"Runtime error: {e}"}, 500
+
+
+def resume(session, game):
+    """Restore a saved game from its snapshot instead of replaying its commands"""
+    if game not in games:
+        return {"status": "error", "message": "Invalid game"}, 404
+
+    state = session.get(f"{game}_state")
+    if not state:
+        return {"status": "error", "message": "No saved game"}, 404
+
+    with pool.checkout(session_id(session), game) as interp:
+        try:
+            interp.restore(state)
+        except InterpreterError as e:
+            # don't leave a half-restored game for the next command
+            interp.restore({})
+            return {"status": "error", "message": str(e)}, 409
+        words = interp.run_once("words", structured=True)
+        history = interp.history()
+
+    # Same shape as a batch response, so the client renders it the same way.
+    # Raildle's picker completes through /complete, so it gets no word list.
+    results = []
+    if game != "raildle":
+        results.append({"command": "words", "result": handle_words(session, game, words)})
+    session[f"{game}_triesCount"] = 0
+    for guess in history:
+        command = f"guess {guess.guess}"
+        results.append({"command": command, "result": handle_guess(session, game, command, guess)})
+
+    return {"status": "success", "results": results}, 200
+
+
+def complete(session, game, query, k):
+    """Prefix search over the loaded bank's words and display names for guess pickers"""
+    if game not in games:
+        return {"status": "error", "message": "Invalid game"}, 404
+
+    try:
+        with game_interpreter(session, game, save=False) as interp:
+            bank = interp.bank
+    except InterpreterError as e:
+        return {"status": "error", "message": str(e)}, 409
+    index = bank.derived("completion", CompletionIndex)
+    matches = [{"value": word, "name": name} for word, name in index.complete(query, k)]
+    return {"status": "success", "matches": matches}, 200
+
+
+def reset_game(session, game):
+    """Resets session values of given game"""
+    session.pop(f"{game}_commands", None)
+    session.pop(f"{game}_secret_word", None)
+    session.pop(f"{game}_words", None)
+    session.pop(f"{game}_triesCount", None)
+    session.pop(f"{game}_state", None)
+    pool.discard(session_id(session), game)
+    return {"message": "Game session cleared"}, 200
+
+
+def handle_result(session, game, command, result):
+    """Turn an interpreter result into the data sent back for command"""
+    if command == "show":
+        return handle_show(session, game, result)
+    elif command.split()[0] == "words":
+        return handle_words(session, game, result)
+    elif command.startswith("guess"):
+        return handle_guess(session, game, command, result)
+
+    return str(result)
+
+
+def handle_show(session, game, result):
+    """Handle 'show' command - save secret word"""
+    if not isinstance(result, ShowResult):
+        return str(result)
+
+    secret_word = result.secret
+    secret_key = f"{game}_secret_word"
+    session[secret_key] = secret_word
+
+    # Print Secret word
+    print(f"Secret word: {session[secret_key]}")
+
+    # update saved session command "word" to have the secret word
+    game_commands = session[f"{game}_commands"]
+    target = "word"
+    index = next((i for i, w in enumerate(game_commands) if target in w), -1)
+
+    if index != -1:
+        game_commands[index] = f"word {secret_word}"
+        session[f"{game}_commands"] = game_commands
+        session.modified = True
+
+    if game == "filmster":
+        # Edit words in session to include secret word and 3 random words
+        filmster_edit_words(session, game, secret_word)
+        return session.get(f"{game}_words", {})
+
+    if game == "snuzzle":
+        # Edit show to give only the secret word
+        return secret_word
+
+    return "Secret word has been saved."
+
+
+def handle_words(session, game, result):
+    """Handle 'words' command - format word list"""
+    if not isinstance(result, WordsResult):
+        return str(result)
+
+    if game == "raildle":
+        return format_raildle_words(game, result.words)
+    elif game == "filmster":
+        return format_filmster_words(session, game, result)
+
+    return str(result)
+
+
+def handle_guess(session, game, command, result):
+    """Handle 'guess' command - process and store guess"""
+    # Only process successful guesses
+    if not isinstance(result, GuessResult):
+        return str(result)
+
+    # Add number of tries in session
+    if not session.get(f"{game}_triesCount"):
+        session[f"{game}_triesCount"] = 0
+    session[f"{game}_triesCount"] += 1
+
+    if game == "raildle":
+        return format_raildle_guess(result, session[f"{game}_triesCount"])
+
+    data = result.to_dict()
+
+    # Append tries count to result
+    data["tries"] = session[f"{game}_triesCount"]
+
+    if game == "filmster":
+        return format_filmster_guess(data, result)
+
+    return data
+
+
+# Helper functions
+
+
+def format_raildle_words(game, keys):
+    """Format word list for Raildle game (keys come sorted from the interpreter)"""
+    return {k: display_name(k) for k in keys}
+
+
+def format_raildle_guess(result, tries):
+    """Format guess result for Raildle game"""
+    data = {
+        "result": result.result,
+        "tries": tries,
+        "character": {"value": result.guess, "name": display_name(result.guess)},
+    }
+    if result.result != "win":
+        data["remaining"] = result.remaining
+
+    # Format feedback
+    formatted_feedback = {}
+    for category, value, code in zip(result.categories, result.values, result.feedback_codes):
+        if category != "World/Faction":
+            value = value.replace(" ", "_")
+        formatted_feedback[category] = {
+            "value": value.strip(),
+            "status": "correct" if code == CORRECT else "wrong"
+        }
+
+    data["feedback"] = formatted_feedback
+
+    # Set character status
+    data["character"]["status"] = "correct" if result.result == "win" else "wrong"
+
+    # Set secret word if result is win/lose
+    if result.secret:
+        data["secret"] = {"value": result.secret, "name": display_name(result.secret)}
+
+    return data
+
+
+# Format filmster words and helper functions
+
+def filmster_hints(bank):
+    """Movie -> its three hints, built once per loaded bank"""
+    return bank.derived("filmster_hints", lambda b: {row[0]: list(row[1:4]) for row in b.word_data if len(row) >= 4})
+
+
+def format_filmster_words(session, game, result):
+    """Format word list for Filmster game - include hints from the loaded bank"""
+    hints = filmster_hints(result.bank)
+    words_with_hints = {key: hints[key] for key in result.words if key in hints}
+
+    # Store in session for later use
+    session[f"{game}_words"] = words_with_hints
+
+    return words_with_hints
+
+
+def format_filmster_guess(data, result):
+    """Format guess result for Filmster game"""
+    # Return the result with secret if game is over
+    if result.secret:
+        # Same spaced name the movie choices show
+        data["secret"] = {"value": result.secret, "name": display_name(result.secret)}
+
+    return data
+
+
+def filmster_edit_words(session, game, secret_word):
+    """Edit Filmster words in session to include secret word and 3 random words"""
+    words_key = f"{game}_words"
+    all_words = list(session.get(words_key, {}).keys())
+
+    # Ensure secret word is included
+    if secret_word not in all_words:
+        all_words.append(secret_word)
+
+    # Select 3 random words excluding the secret word
+    random_words = random.sample([w for w in all_words if w != secret_word], 3)
+
+    # Final list includes secret word and 3 random words
+    final_words = [secret_word] + random_words
+    random.shuffle(final_words)
+
+    # Update session words
+    formatted_words = {k: display_name(k) for k in final_words}
+
+    session[f"{game}_words"] = formatted_words
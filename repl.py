@@ -1,5 +1,4 @@
-from Interpreter import Interpreter, InterpreterError
-import json
+from Interpreter import Interpreter, InterpreterError, GuessResult
 import sys
 
 COLORS = {
@@ -10,32 +9,28 @@ COLORS = {
     "❌": "\033[91m❌\033[0m"
 }
 
-def render_feedback(raw):
-    """Format feedback returned from the interpreter, including JSON results."""
-    try:
-        data = json.loads(raw)
-        if not isinstance(data, dict):
-            return raw
+def render_feedback(result):
+    """Format a result returned from the interpreter for the terminal."""
+    if not isinstance(result, GuessResult):
+        return str(result)
 
-        fb = data.get("feedback", [])
-        if isinstance(fb, list):
-            # Join and color category-style feedback
-            feedback_text = "\n".join(fb)
-        else:
-            # Color word-style feedback like 🟩🟨⬜
-            feedback_text = "".join(COLORS.get(ch, ch) for ch in str(fb))
+    fb = result.feedback
+    if isinstance(fb, list):
+        # Join and color category-style feedback
+        feedback_text = "\n".join(fb)
+    else:
+        # Color word-style feedback like 🟩🟨⬜
+        feedback_text = "".join(COLORS.get(ch, ch) for ch in str(fb))
 
-        extra = []
-        if "hint" in data:
-            extra.append(f"Hint: {data['hint']}")
-        if "remaining" in data:
-            extra.append(f"Guesses left: {data['remaining']}")
-        if data.get("result") == "win":
-            extra.append("🎉 You guessed it!")
+    extra = []
+    if result.hint:
+        extra.append(f"Hint: {result.hint}")
+    if result.result == "win":
+        extra.append("🎉 You guessed it!")
+    else:
+        extra.append(f"Guesses left: {result.remaining}")
 
-        return "\n".join(filter(None, [feedback_text] + extra))
-    except json.JSONDecodeError:
-        return raw
+    return "\n".join(filter(None, [feedback_text] + extra))
 
 
 def repl():
@@ -54,7 +49,7 @@ def repl():
             if not command:
                 continue
 
-            result = interp.run_once(command)
+            result = interp.run_once(command, structured=True)
             if result:
                 print(render_feedback(result))
 
@@ -0,0 +1,206 @@
+"""Server-side Flask sessions.
+
+The session cookie only carries a signed, random session id; the session
+data itself lives in a SessionStore (in-memory LRU or SQLite).
+"""
+import importlib
+import json
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+
+class SessionStore(ABC):
+    """Backend interface: session data is stored as JSON text under its id."""
+
+    @abstractmethod
+    def load(self, sid):
+        """The session data stored under sid, or None if it is missing or expired."""
+
+    @abstractmethod
+    def save(self, sid, data, lifetime):
+        """Store data under sid for lifetime seconds."""
+
+    @abstractmethod
+    def delete(self, sid):
+        """Forget sid."""
+
+
+class MemorySessionStore(SessionStore):
+    """Per-process store that drops the least recently used sessions past max_entries."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if entry[1] < now:
+                del self._data[sid]
+                return None
+            self._data.move_to_end(sid)
+            return json.loads(entry[0])
+
+    def save(self, sid, data, lifetime):
+        text = json.dumps(data)
+        with self._lock:
+            self._data[sid] = (text, time.time() + lifetime)
+            self._data.move_to_end(sid)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a SQLite file, shared by every process that opens it."""
+
+    # expired rows are swept once every this many saves
+    PURGE_EVERY = 500
+
+    def __init__(self, path="sessions.sqlite3"):
+        self.path = path
+        self._local = threading.local()
+        self._saves = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " id TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, sid):
+        row = self._connect().execute(
+            "SELECT data FROM sessions WHERE id = ? AND expires >= ?", (sid, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, sid, data, lifetime):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, data, expires) VALUES (?, ?, ?)",
+                (sid, json.dumps(data), now + lifetime),
+            )
+            self._saves += 1
+            if self._saves % self.PURGE_EVERY == 0:
+                conn.execute("DELETE FROM sessions WHERE expires < ?", (now,))
+
+    def delete(self, sid):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (sid,))
+
+
+def create_store(backend="memory", path=None):
+    """Build a SessionStore: "memory", "sqlite", or "module:factory" called with path."""
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore(path or "sessions.sqlite3")
+    if ":" in backend:
+        module, name = backend.split(":", 1)
+        store = getattr(importlib.import_module(module), name)(path)
+        if not isinstance(store, SessionStore):
+            raise TypeError(f"Session backend '{backend}' did not return a SessionStore")
+        return store
+    raise ValueError(f"Unknown session backend '{backend}'")
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask session interface backed by a SessionStore."""
+
+    salt = "lexis-session"
+
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, secret_key):
+        return Signer(secret_key, salt=self.salt)
+
+    def session_for_cookie(self, secret_key, cookie):
+        """The stored session a signed cookie value points to, or a new one."""
+        if cookie:
+            try:
+                sid = self._signer(secret_key).unsign(cookie).decode()
+            except BadSignature:
+                sid = None
+            if sid:
+                data = self.store.load(sid)
+                if data is not None:
+                    return ServerSideSession(data, sid=sid)
+        return ServerSideSession(sid=uuid4().hex, new=True)
+
+    def persist(self, secret_key, session, lifetime):
+        """Write session back to the store.
+
+        Returns the signed cookie value to send, "" if the cookie should be
+        deleted, or None if it can stay as it is.
+        """
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                return ""
+            return None
+        if not session.modified:
+            return None
+        self.store.save(session.sid, dict(session), lifetime)
+        return self._signer(secret_key).sign(session.sid).decode()
+
+    def open_session(self, app, request):
+        if not app.secret_key:
+            return None
+        return self.session_for_cookie(app.secret_key, request.cookies.get(self.get_cookie_name(app)))
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        cookie = self.persist(app.secret_key, session, lifetime)
+        if cookie == "":
+            response.delete_cookie(name, domain=domain, path=path)
+        elif cookie is not None:
+            response.set_cookie(
+                name,
+                cookie,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
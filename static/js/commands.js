@@ -43,6 +43,29 @@ function sendBatchCommands(commands, game) {
     });
 }
 
+function resumeGame(game) {
+    return new Promise((resolve, reject) => {
+        $.ajax({
+            url: `/resume/${game}`,
+            type: "POST",
+            contentType: "application/json",
+            data: JSON.stringify({ game: game }),
+            success: function(res) {
+                // Same shape as a batch response
+                if (res.status === "success" && res.results) {
+                    res.results.forEach(item => {
+                        handleCommandResponse(item.command, game, item.result);
+                    });
+                }
+                resolve(res);
+            },
+            error: function(err) {
+                reject(err);
+            }
+        });
+    });
+}
+
 function handleCommandResponse(cmd, game, response) {
     // Route to game-specific handlers
     if (game === "raildle") {
@@ -86,8 +109,13 @@ async function initGame(game, max_guesses = 6, secret_word = "") {
             // Fetch previous session commands
             const sessionData = await getCommands(game);
 
-            // If game is already active and a guess has been made, replay previous session
-            if (isGameActive(game) && sessionData && sessionData.commands && sessionData.commands.length > 6) {
+            // If game is already active and a guess has been made, restore previous session
+            const guessed = sessionData && sessionData.commands && sessionData.commands.some(cmd => cmd.startsWith("guess"));
+            if (isGameActive(game) && guessed) {
+                // Restore the saved snapshot; replay the commands only if that fails
+                const resumed = await resumeGame(game).catch(() => null);
+                if (resumed && resumed.status === "success") return resumed;
+
                 const response = await sendBatchCommands(sessionData.commands, game);
                 return response;
             }
@@ -101,7 +129,8 @@ async function initGame(game, max_guesses = 6, secret_word = "") {
             `word ${secret_word}`,
             "show"
         ];
-        if (game == "raildle" || game == "filmster") commands.splice(4, 0, "words");
+        // Raildle's picker completes on the server (/complete), so only Filmster needs the word list
+        if (game == "filmster") commands.splice(4, 0, "words");
 
         // Set game as active
         setGameActive(game, true);
@@ -8,13 +8,25 @@ $(document).ready(function () {
     // Initialize game features
     initGame(game, max_guesses, secret_word);
 
-    // Initialize select2
+    // Initialize select2; options are fetched from the server as the user types
     $('#character-select').select2({
         placeholder: "Enter Character Name",
         allowClear: true,
         dropdownParent: $('body'),
         templateResult: formatOption,
-        matcher: matchStart // Custom matcher for start-of-word matching
+        ajax: {
+            url: `/complete/${game}`,
+            dataType: "json",
+            delay: 100,
+            data: params => ({ q: params.term || "", k: 20 }),
+            processResults: res => ({
+                results: (res.matches || []).map(m => ({
+                    id: m.value,
+                    text: m.name,
+                    disabled: selectedCharacters.includes(m.value) // already guessed
+                }))
+            })
+        }
     });
 
     // Show winstreak
@@ -22,11 +34,8 @@ $(document).ready(function () {
 
     $('#character-select').on('select2:select', function (e) {
         const selectedId = e.params.data.id;
+        // remembered so the picker shows it disabled from now on
         selectedCharacters.push(selectedId);
-        
-        // disable the selected option so it can't be chosen again
-        $(this).find(`option[value="${selectedId}"]`).prop('disabled', true);
-        $(this).trigger('change.select2');
 
         // Update Table
         sendCommand(`guess ${selectedId}`, game);
@@ -49,61 +58,18 @@ $(document).ready(function () {
             $("#answers-table tr").not(":first").remove();
             $(".raildle-tries-card__result-container").remove();
 
-            // Reset disabled dropdown options
-            for (var chara of selectedCharacters){
-                $('#character-select').find(`option[value="${chara}"]`).prop('disabled', false);
-                $('#character-select').trigger('change.select2');
-            }
+            // Re-enable every character in the picker
+            selectedCharacters = [];
         } catch (error) {
             console.error("Error restarting game:", error);
         }
     })
 });
 
-// Custom matcher: matches consecutive words in order
-function matchStart(params, data) {
-    // If there are no search terms, return all data
-    if ($.trim(params.term) === '') {
-        return data;
-    }
-    // Do not display the item if there is no 'text' property
-    if (typeof data.text === 'undefined') {
-        return null;
-    }
-    
-    var term = params.term.toLowerCase().trim();
-    var text = data.text.toLowerCase();
-    
-    // Split search term and text into words
-    var searchWords = term.split(/\s+/);
-    var textWords = text.split(/\s+/);
-    
-    // Try to find consecutive matches starting from each text word
-    for (var i = 0; i <= textWords.length - searchWords.length; i++) {
-        var allMatch = true;
-        
-        // Check if all search words match consecutively
-        for (var j = 0; j < searchWords.length; j++) {
-            if (textWords[i + j].indexOf(searchWords[j]) !== 0) {
-                allMatch = false;
-                break;
-            }
-        }
-        
-        if (allMatch) {
-            return data;
-        }
-    }
-    
-    // Return null if no consecutive match found
-    return null;
-}
-
 function formatOption(option) {
     if (!option.id) return option.text;
     
-    const img = $(option.element).data('img');
-    if (!img) return option.text;
+    const img = $(option.element).data('img') || `static/images/raildle/character/${option.id}.png`;
     
     return $(
         `<div style="display: flex; align-items: center; padding: 0.2rem;">